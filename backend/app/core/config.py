@@ -5,15 +5,53 @@ class Settings(BaseSettings):
     # --- DATABASE ---
     MONGO_URL: str = "mongodb://mongo:27017"
     DB_NAME: str = "payroll_db"
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
 
     # --- AUTH ---
     JWT_SECRET: str = "super-secret-key"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    USER_CACHE_TTL_SECONDS: float = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = one per CPU
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 0  # 0 = 2 x workers
 
     # --- BIOMETRIC API ---
     BIOMETRIC_API_URL: str
     BIOMETRIC_API_TOKEN: str
+    BIOMETRIC_API_TIMEOUT: float = 30
+    BIOMETRIC_MAX_WORKERS: int = 4
+    BIOMETRIC_WINDOW_DAYS: int = 7
+    BIOMETRIC_EMP_CODES_PER_WINDOW: int = 0  # 0 = Empcode=ALL
+    BIOMETRIC_MAX_RETRIES: int = 3
+    BIOMETRIC_RETRY_BACKOFF: float = 0.5
+
+    # --- ATTENDANCE INGESTION ---
+    ATTENDANCE_BULK_CHUNK_SIZE: int = 1000
+    INGESTION_WORKERS: int = 2
+    INGESTION_SPOOL_DIR: str = "/tmp/attendance_uploads"
+    INGESTION_JOB_STALE_SECONDS: int = 120
+
+    # --- EMPLOYEE IMPORT ---
+    EMPLOYEE_IMPORT_MAX_ROWS: int = 5000
+    EMPLOYEE_IMPORT_BATCH_SIZE: int = 500
+
+    # --- CALENDAR ---
+    CALENDAR_CACHE_TTL_SECONDS: float = 300
+
+    # --- PAYSLIPS ---
+    PAYSLIP_OUTPUT_DIR: str = "/var/lib/payroll/payslips"
+    PAYSLIP_WORKERS: int = 0  # 0 = one per CPU
+    PAYSLIP_SHARD_SIZE: int = 250
+
+    # --- METRICS ---
+    METRICS_TOKEN: str = ""  # empty = /metrics needs no token
+
+    # --- PROFILING ---
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5
+    PROFILE_RETENTION_DAYS: int = 7
 
     class Config:
         env_file = ".env"
@@ -1,6 +1,14 @@
 from datetime import date, timedelta
+from functools import lru_cache
 
+from fastapi import HTTPException
+
+@lru_cache(maxsize=256)
 def get_all_dates_of_month(year: int, month: int):
+    """
+    Every date of the month, built once per month and shared
+    (hence a tuple).
+    """
     start = date(year, month, 1)
     dates = []
 
@@ -9,9 +17,28 @@ def get_all_dates_of_month(year: int, month: int):
         dates.append(current)
         current += timedelta(days=1)
 
-    return dates
+    return tuple(dates)
+
+
+def get_month_bounds(year: int, month: int):
+    """
+    Returns the ISO date strings [start, end) covering the month,
+    matching the "date" field format of attendance_daily.
+    """
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start.isoformat(), end.isoformat()
 
 
-def is_weekly_off(d: date):
-    # Saturday = 5, Sunday = 6
-    return d.weekday() in (5, 6)
+def parse_month(month: str):
+    """
+    Validates a "YYYY-MM" month from a request. Returns
+    (year, month, start, end) with the ISO bounds of get_month_bounds;
+    anything else is a 400.
+    """
+    try:
+        year, mon = map(int, month.split("-"))
+        start, end = get_month_bounds(year, mon)
+    except (AttributeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid month, expected YYYY-MM")
+    return year, mon, start, end
@@ -0,0 +1,50 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.database.versions import get_versions
+
+
+async def collection_etag(request: Request, *collections: str) -> str:
+    """
+    Weak ETag for a GET response built from ``collections``: changes
+    whenever one of their write counters is bumped or the query string
+    differs. Weak because GZipMiddleware may re-encode the body.
+
+    Versions are read before the body is built, so a write racing with
+    the build can only make the ETag older than the body, never newer.
+    """
+    versions = await get_versions(collections)
+    key = "|".join(
+        [request.url.path, str(request.query_params)]
+        + [f"{name}:{versions[name]}" for name in sorted(versions)]
+    )
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response when the client already holds ``etag``, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+
+    # Weak comparison: W/"x" matches "x"
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    if etag.removeprefix("W/") in tags or "*" in tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def etag_response(content, etag: str, headers: Optional[dict] = None) -> JSONResponse:
+    return JSONResponse(
+        jsonable_encoder(content),
+        headers={
+            "ETag": etag,
+            # Always revalidate; the 304 keeps that cheap
+            "Cache-Control": "private, no-cache",
+            **(headers or {}),
+        },
+    )
@@ -0,0 +1,265 @@
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+from pymongo import monitoring
+
+# Prometheus' default latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{_format_labels(self.labels, label_values)} "
+                    f"{_format_value(value)}"
+                )
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for label_values, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    labels = _format_labels(
+                        self.labels, label_values, [("le", _format_value(float(bound)))]
+                    )
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+                labels = _format_labels(self.labels, label_values)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, documentation: str, labels=()) -> Counter:
+        metric = Counter(name, documentation, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# ---------- HTTP ----------
+http_requests = registry.counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status code.",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route"),
+)
+http_request_mongo_commands = registry.histogram(
+    "http_request_mongo_commands",
+    "Mongo commands issued while serving one request; high counts point at N+1 queries.",
+    ("method", "route"),
+    buckets=COUNT_BUCKETS,
+)
+http_request_mongo_seconds = registry.histogram(
+    "http_request_mongo_seconds",
+    "Total Mongo round-trip time spent while serving one request.",
+    ("method", "route"),
+)
+
+# ---------- MONGO ----------
+mongo_commands = registry.counter(
+    "mongo_commands_total",
+    "Mongo commands by command name and collection.",
+    ("command", "collection"),
+)
+mongo_command_failures = registry.counter(
+    "mongo_command_failures_total",
+    "Failed Mongo commands by command name.",
+    ("command",),
+)
+mongo_command_duration = registry.histogram(
+    "mongo_command_duration_seconds",
+    "Mongo command round-trip time by command name and collection.",
+    ("command", "collection"),
+)
+
+# ---------- INGESTION / PAYROLL ----------
+attendance_employee_days = registry.counter(
+    "attendance_employee_days_processed_total",
+    "Employee-days evaluated by biometric ingestion.",
+)
+attendance_writes = registry.counter(
+    "attendance_writes_total",
+    "Employee-days seen by ingestion, by outcome (written, unchanged, skipped_manual).",
+    ("outcome",),
+)
+attendance_bulk_writes = registry.counter(
+    "attendance_bulk_writes_total",
+    "bulk_write round trips issued by ingestion.",
+)
+ingestion_duration = registry.histogram(
+    "attendance_ingestion_duration_seconds",
+    "Wall time of one ingest_biometric_punches run.",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+jobs_finished = registry.counter(
+    "jobs_finished_total",
+    "Background jobs by kind and final status.",
+    ("kind", "status"),
+)
+job_duration = registry.histogram(
+    "job_duration_seconds",
+    "Wall time of background jobs by kind.",
+    ("kind",),
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600),
+)
+payroll_rollup_refreshes = registry.counter(
+    "payroll_rollup_refreshes_total",
+    "payroll_monthly refreshes by scope (full month or some employees).",
+    ("scope",),
+)
+payroll_rollup_writes = registry.counter(
+    "payroll_rollup_writes_total",
+    "payroll_monthly documents upserted by rollup refreshes.",
+)
+payslips_generated = registry.counter(
+    "payslips_generated_total",
+    "Payslip files written (unchanged payslips are not counted).",
+)
+
+
+# ---------- PER-REQUEST MONGO STATS ----------
+
+# Holds a [command count, seconds] list per request; the listener updates
+# it in place so the numbers also reach back from threadpool-run sync
+# handlers.
+request_mongo_stats: ContextVar[Optional[list]] = ContextVar(
+    "request_mongo_stats", default=None
+)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Feeds the mongo_* metrics and the current request's Mongo stats.
+
+    Only started events carry the command document (and run in the
+    caller's context), so the collection and the request's stats list
+    are kept until the matching succeeded/failed event, keyed by
+    connection and request_id.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        name = event.command_name
+        collection = event.command.get(name)
+        if name == "getMore":
+            collection = event.command.get("collection")
+        if not isinstance(collection, str):
+            collection = ""
+
+        mongo_commands.inc(1, name, collection)
+
+        stats = request_mongo_stats.get()
+        if stats is not None:
+            stats[0] += 1
+
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (collection, stats)
+
+    def _finished(self, event):
+        with self._lock:
+            collection, stats = self._pending.pop(
+                (event.connection_id, event.request_id), ("", None)
+            )
+
+        seconds = event.duration_micros / 1e6
+        mongo_command_duration.observe(seconds, event.command_name, collection)
+        if stats is not None:
+            stats[1] += seconds
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+        mongo_command_failures.inc(1, event.command_name)
+
+
+mongo_command_listener = MongoCommandMetrics()
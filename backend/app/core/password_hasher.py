@@ -0,0 +1,120 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from passlib.context import CryptContext
+
+_worker_context = None
+
+
+def _init_worker(rounds: int):
+    global _worker_context
+    _worker_context = CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=rounds,
+    )
+
+
+def _hash(password: str) -> str:
+    return _worker_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return _worker_context.verify(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool so hashing never holds the
+    GIL of the API process. At most ``max_concurrency`` jobs are handed
+    to the pool at once; further callers wait in line and are counted
+    in the queue-depth metrics.
+    """
+
+    def __init__(self, workers: int, max_concurrency: int, rounds: int):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers * 2
+        self.rounds = rounds
+
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._semaphore = None
+
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.rounds,),
+                )
+            return self._pool
+
+    async def _run(self, fn, *args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        queued_at = perf_counter()
+        # Only callers that find every slot taken actually wait in line
+        waiting = self._semaphore.locked()
+        if waiting:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        try:
+            async with self._semaphore:
+                if waiting:
+                    self.queued -= 1
+                    waiting = False
+                started = perf_counter()
+                self.total_wait_seconds += started - queued_at
+
+                self.in_flight += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self._get_pool(), fn, *args)
+                finally:
+                    self.in_flight -= 1
+                    self.completed += 1
+                    self.total_run_seconds += perf_counter() - started
+        finally:
+            # Cancelled while still waiting for a slot
+            if waiting:
+                self.queued -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, password, hashed_password)
+
+    def stats(self):
+        completed = self.completed
+        return {
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "bcrypt_rounds": self.rounds,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": completed,
+            "avg_wait_ms": round(self.total_wait_seconds / completed * 1000, 2) if completed else 0.0,
+            "avg_run_ms": round(self.total_run_seconds / completed * 1000, 2) if completed else 0.0,
+        }
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,218 @@
+import cProfile
+import functools
+import inspect
+import io
+import marshal
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+
+PROFILE_CPROFILE = "cprofile"  # deterministic, every call
+PROFILE_SAMPLE = "sample"  # stack sampling, low overhead
+PROFILE_MODES = (PROFILE_CPROFILE, PROFILE_SAMPLE)
+
+# Lines of the text report kept alongside the raw data
+REPORT_LINES = 60
+
+# Only one profile runs at a time: cProfile hooks are per thread and the
+# event loop thread is shared by every request
+_busy = threading.Lock()
+
+
+class ProfileSession:
+    """
+    Profiles whatever runs on the threads that join it: the event loop
+    thread for async handlers plus the threadpool thread of a sync
+    handler (see ProfiledRoute) or a background job thread.
+
+    Async work of other requests served on the event loop meanwhile ends
+    up in the profile too.
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._profiles = []
+        self._threads = set()
+        self._samples = Counter()
+        self._sample_count = 0
+        self._stop = threading.Event()
+        self._sampler = None
+        self.started = None
+        self.elapsed = None
+
+    # ---------- LIFECYCLE ----------
+
+    def start(self):
+        self.started = perf_counter()
+        if self.mode == PROFILE_SAMPLE:
+            self._sampler = threading.Thread(
+                target=self._sample_loop,
+                name="profile-sampler",
+                daemon=True,
+            )
+            self._sampler.start()
+
+    def stop(self):
+        self.elapsed = perf_counter() - self.started
+        if self._sampler:
+            self._stop.set()
+            self._sampler.join()
+
+    def enter_thread(self):
+        """Starts profiling the calling thread; returns a token for exit_thread."""
+        if self.mode == PROFILE_CPROFILE:
+            profile = cProfile.Profile()
+            profile.enable()
+            return profile
+
+        with self._lock:
+            self._threads.add(threading.get_ident())
+        return None
+
+    def exit_thread(self, token):
+        if self.mode == PROFILE_CPROFILE:
+            token.disable()
+            with self._lock:
+                self._profiles.append(token)
+            return
+
+        with self._lock:
+            self._threads.discard(threading.get_ident())
+
+    # ---------- SAMPLING ----------
+
+    def _sample_loop(self):
+        interval = settings.PROFILE_SAMPLE_INTERVAL_MS / 1000
+        while not self._stop.wait(interval):
+            with self._lock:
+                threads = list(self._threads)
+            frames = sys._current_frames()
+
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_filename}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                stack.reverse()
+
+                with self._lock:
+                    self._samples[";".join(stack)] += 1
+                    self._sample_count += 1
+
+    # ---------- OUTPUT ----------
+
+    def report(self):
+        """Returns (text report, raw data bytes, data file extension)."""
+        if self.mode == PROFILE_CPROFILE:
+            return self._cprofile_report()
+        return self._sample_report()
+
+    def _cprofile_report(self):
+        if not self._profiles:
+            return "No calls recorded\n", b"", "prof"
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profiles[0], stream=stream)
+        for profile in self._profiles[1:]:
+            stats.add(profile)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(REPORT_LINES)
+
+        # Same bytes pstats.dump_stats writes: loads in snakeviz/pstats.
+        # The full paths are kept; strip_dirs only shortened the report.
+        full = pstats.Stats(self._profiles[0])
+        for profile in self._profiles[1:]:
+            full.add(profile)
+        return stream.getvalue(), marshal.dumps(full.stats), "prof"
+
+    def _sample_report(self):
+        # Collapsed stacks, the input format of flamegraph.pl and speedscope
+        collapsed = "\n".join(
+            f"{stack} {count}" for stack, count in self._samples.most_common()
+        )
+
+        # Self time per function: the leaf of each sampled stack
+        leaves = Counter()
+        for stack, count in self._samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+
+        total = self._sample_count or 1
+        lines = [
+            f"{self._sample_count} samples every "
+            f"{settings.PROFILE_SAMPLE_INTERVAL_MS} ms",
+            "",
+            "   self%  samples  location",
+        ]
+        for location, count in leaves.most_common(REPORT_LINES):
+            lines.append(f"{100 * count / total:8.1f} {count:8d}  {location}")
+
+        return "\n".join(lines) + "\n", collapsed.encode(), "folded"
+
+
+# The session profiling the current request or job, if any
+active_profile: ContextVar[Optional[ProfileSession]] = ContextVar(
+    "active_profile", default=None
+)
+
+
+def begin_profile(mode: str) -> Optional[ProfileSession]:
+    """
+    Starts a session for a request, or returns None when another
+    profile is already running. Threads join it with enter_thread.
+    """
+    if not _busy.acquire(blocking=False):
+        return None
+    session = ProfileSession(mode)
+    session.start()
+    return session
+
+
+def end_profile(session: ProfileSession):
+    session.stop()
+    _busy.release()
+
+
+def profiled_endpoint(endpoint):
+    """
+    Sync endpoints run in a threadpool thread the event loop thread's
+    profiler can't see, so they join the active session themselves.
+    Costs one ContextVar lookup when nothing is being profiled.
+    """
+    # include_router rebuilds routes from the already wrapped endpoint
+    if inspect.iscoroutinefunction(endpoint) or getattr(endpoint, "_profiled", False):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        session = active_profile.get()
+        if session is None:
+            return endpoint(*args, **kwargs)
+
+        token = session.enter_thread()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            session.exit_thread(token)
+
+    wrapper._profiled = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route class for routers whose requests can be profiled on demand."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, profiled_endpoint(endpoint), **kwargs)
@@ -1,16 +1,36 @@
 from datetime import datetime, timedelta
+from typing import Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from bson import ObjectId
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.database.mongo import users_collection
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.password_hasher import PasswordHasher
+from app.database.mongo import async_users_collection
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
 security = HTTPBearer()
 
+# bcrypt runs here in request handlers, off the API process
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Active users by ID, so authenticated requests skip the users lookup
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -20,6 +40,14 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(password, hashed_password)
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(
@@ -33,7 +61,19 @@ def create_access_token(data: dict):
     )
 
 
-def get_current_user(
+def read_token_payload(token: str) -> Optional[dict]:
+    """Claims of a valid access token, or None. Does not look up the user."""
+    try:
+        return jwt.decode(
+            token,
+            settings.JWT_SECRET,
+            algorithms=[settings.JWT_ALGORITHM]
+        )
+    except JWTError:
+        return None
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     token = credentials.credentials
@@ -59,15 +99,42 @@ def get_current_user(
             detail="Invalid or expired token"
         )
 
-    user = users_collection.find_one(
-        {"_id": ObjectId(user_id), "is_active": True}
-    )
-
-    if not user:
+    user = await get_active_user(user_id)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive"
         )
-
-    user["_id"] = str(user["_id"])
     return user
+
+
+async def get_active_user(user_id: str) -> Optional[dict]:
+    """
+    The active user with this ID (cached, without the password), or
+    None. Callers get their own copy, never the cached dict.
+    """
+    user = user_cache.get(user_id)
+    if user is None:
+        if not ObjectId.is_valid(user_id):
+            return None
+
+        user = await async_users_collection.find_one(
+            {"_id": ObjectId(user_id), "is_active": True},
+            {"password": 0}
+        )
+        if not user:
+            return None
+
+        user["_id"] = str(user["_id"])
+        user_cache.set(user_id, user)
+
+    return dict(user)
+
+
+def invalidate_cached_user(user_id):
+    """
+    Drops a user from the cache. Call after creating, modifying or
+    deactivating a user (or the employee behind it).
+    """
+    if user_id:
+        user_cache.invalidate(str(user_id))
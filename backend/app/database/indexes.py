@@ -0,0 +1,142 @@
+import logging
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.core.config import settings
+from app.database.mongo import db
+
+logger = logging.getLogger(__name__)
+
+# collection → indexes backing the query shapes used in app/services
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email"),
+    ],
+    "employees": [
+        IndexModel([("is_active", ASCENDING)], name="is_active"),
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("emp_code", ASCENDING)], name="emp_code"),
+        IndexModel(
+            [("is_active", ASCENDING), ("department", ASCENDING), ("_id", ASCENDING)],
+            name="is_active_department__id",
+        ),
+        IndexModel(
+            [("is_active", ASCENDING), ("designation", ASCENDING), ("_id", ASCENDING)],
+            name="is_active_designation__id",
+        ),
+    ],
+    "attendance_daily": [
+        IndexModel(
+            [("employee_id", ASCENDING), ("date", ASCENDING)],
+            name="employee_id_date",
+            unique=True,
+        ),
+        IndexModel(
+            [("emp_code", ASCENDING), ("date", ASCENDING)],
+            name="emp_code_date",
+        ),
+        IndexModel([("date", ASCENDING)], name="date"),
+    ],
+    "payroll_monthly": [
+        IndexModel(
+            [("month", ASCENDING), ("employee_id", ASCENDING)],
+            name="month_employee_id",
+            unique=True,
+        ),
+        IndexModel(
+            [("month", ASCENDING), ("name", ASCENDING)],
+            name="month_name",
+        ),
+        IndexModel(
+            [("month", ASCENDING), ("department", ASCENDING), ("designation", ASCENDING)],
+            name="month_department_designation",
+        ),
+    ],
+    "payroll_cube": [
+        IndexModel(
+            [("month", ASCENDING), ("department", ASCENDING), ("designation", ASCENDING)],
+            name="month_department_designation",
+            unique=True,
+        ),
+    ],
+    "payslips": [
+        IndexModel(
+            [("month", ASCENDING), ("employee_id", ASCENDING)],
+            name="month_employee_id",
+            unique=True,
+        ),
+    ],
+    "calendar_weekly_off": [
+        IndexModel(
+            [("scope", ASCENDING), ("key", ASCENDING)],
+            name="scope_key",
+            unique=True,
+        ),
+    ],
+    "calendar_holidays": [
+        IndexModel([("date", ASCENDING)], name="date"),
+    ],
+    "departments": [
+        IndexModel([("code", ASCENDING)], name="code"),
+        IndexModel([("is_active", ASCENDING)], name="is_active"),
+    ],
+    "designations": [
+        IndexModel(
+            [("department_code", ASCENDING), ("name", ASCENDING)],
+            name="department_code_name",
+        ),
+        IndexModel([("is_active", ASCENDING)], name="is_active"),
+    ],
+    "ingestion_jobs": [
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+        IndexModel(
+            [("month", ASCENDING), ("created_at", DESCENDING)],
+            name="month_created_at",
+        ),
+        IndexModel(
+            [("status", ASCENDING), ("heartbeat_at", ASCENDING)],
+            name="status_heartbeat_at",
+        ),
+    ],
+    "request_profiles": [
+        IndexModel(
+            [("created_at", ASCENDING)],
+            name="created_at_ttl",
+            expireAfterSeconds=settings.PROFILE_RETENTION_DAYS * 86400,
+        ),
+    ],
+    "upload_archive.files": [
+        IndexModel(
+            [("metadata.sha256", ASCENDING), ("metadata.month", ASCENDING)],
+            name="metadata_sha256_month",
+            unique=True,
+        ),
+        IndexModel([("uploadDate", DESCENDING)], name="uploadDate"),
+    ],
+    "backfill_checkpoints": [
+        IndexModel(
+            [("run_id", ASCENDING), ("month", ASCENDING), ("partition", ASCENDING)],
+            name="run_id_month_partition",
+            unique=True,
+        ),
+    ],
+}
+
+
+def ensure_indexes():
+    """
+    Creates every index in INDEXES. Safe to call on each startup:
+    existing indexes are left as they are. A failure on one collection
+    (e.g. duplicate data blocking a unique index) is logged and does not
+    stop the others or the app.
+    """
+    for collection, indexes in INDEXES.items():
+        try:
+            db[collection].create_indexes(indexes)
+        except OperationFailure as exc:
+            logger.error(
+                "Could not create indexes on %s: %s",
+                collection,
+                exc.details.get("errmsg") if exc.details else exc,
+            )
@@ -1,7 +1,26 @@
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient
 from app.core.config import settings
+from app.core.metrics import mongo_command_listener
 
-client = MongoClient(settings.MONGO_URL)
+# Sync client: CLI scripts, ingestion workers and backfill processes
+client = MongoClient(
+    settings.MONGO_URL,
+    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+    event_listeners=[mongo_command_listener],
+)
 db = client[settings.DB_NAME]
 
 users_collection = db["users"]
+
+# Async client: request handlers, so they don't hold a threadpool slot
+# while waiting on Mongo
+async_client = AsyncMongoClient(
+    settings.MONGO_URL,
+    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+    event_listeners=[mongo_command_listener],
+)
+async_db = async_client[settings.DB_NAME]
+
+async_users_collection = async_db["users"]
@@ -0,0 +1,35 @@
+from app.database.mongo import async_db, db
+
+# One counter document per collection: {"_id": <collection>, "version": n}
+collection_versions = db["collection_versions"]
+async_collection_versions = async_db["collection_versions"]
+
+
+def bump_version(*collections: str):
+    """
+    Marks ``collections`` as changed. Every service that writes to a
+    collection served through an ETag (see app.core.http_cache) calls
+    this after the write.
+    """
+    for name in collections:
+        collection_versions.update_one(
+            {"_id": name},
+            {"$inc": {"version": 1}},
+            upsert=True,
+        )
+
+
+async def bump_version_async(*collections: str):
+    for name in collections:
+        await async_collection_versions.update_one(
+            {"_id": name},
+            {"$inc": {"version": 1}},
+            upsert=True,
+        )
+
+
+async def get_versions(collections) -> dict:
+    versions = {name: 0 for name in collections}
+    async for doc in async_collection_versions.find({"_id": {"$in": list(collections)}}):
+        versions[doc["_id"]] = doc.get("version", 0)
+    return versions
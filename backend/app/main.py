@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.routes.auth_routes import router as auth_router
 from app.routes.admin_routes import router as admin_router
 from app.routes.employee_routes import router as employee_router
@@ -7,6 +8,16 @@ from app.routes.superadmin_routes import router as superadmin_router
 from app.routes.attendance_routes import router as attendance_router
 from app.routes.department_routes import router as department_router
 from app.routes.designation_routes import router as designation_router
+from app.routes.payroll_routes import router as payroll_router
+from app.routes.analytics_routes import router as analytics_router
+from app.routes.calendar_routes import router as calendar_router
+from app.routes.metrics_routes import router as metrics_router
+from app.routes.profile_routes import router as profile_router
+from app.core.security import password_hasher
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.database.indexes import ensure_indexes
+from app.services.job_service import recover_ingestion_jobs
 app = FastAPI(title="Payroll Management System")
 
 app.add_middleware(
@@ -18,7 +29,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Profile-Id", "X-Profile"],
 )
+# Only bodies above 1 KB are worth compressing
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+# Inside the metrics middleware, so profiled requests still get timed
+app.add_middleware(ProfilingMiddleware)
+# Outermost, so latency includes compression and CORS handling
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth_router)
 app.include_router(admin_router)
@@ -27,6 +45,20 @@ app.include_router(superadmin_router)
 app.include_router(attendance_router)
 app.include_router(department_router)
 app.include_router(designation_router)
+app.include_router(payroll_router)
+app.include_router(analytics_router)
+app.include_router(calendar_router)
+app.include_router(metrics_router)
+app.include_router(profile_router)
+
+@app.on_event("startup")
+def on_startup():
+    ensure_indexes()
+    recover_ingestion_jobs()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    password_hasher.shutdown()
 
 @app.get("/")
 def health_check():
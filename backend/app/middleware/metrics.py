@@ -0,0 +1,56 @@
+from time import perf_counter
+
+from app.core.metrics import (
+    http_request_duration,
+    http_request_mongo_commands,
+    http_request_mongo_seconds,
+    http_requests,
+    request_mongo_stats,
+)
+
+# Label for requests no route matched, so unknown paths can't blow up
+# the label cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and the number of Mongo commands and their
+    total time per request, labelled by route template (/admin/employees/{employee_id})
+    rather than the raw path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        mongo_stats = [0, 0.0]
+        token = request_mongo_stats.set(mongo_stats)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = perf_counter() - started
+            request_mongo_stats.reset(token)
+
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+
+            http_requests.inc(1, method, path, str(status))
+            http_request_duration.observe(elapsed, method, path)
+            http_request_mongo_commands.observe(mongo_stats[0], method, path)
+            http_request_mongo_seconds.observe(mongo_stats[1], method, path)
@@ -0,0 +1,128 @@
+import logging
+from urllib.parse import parse_qs
+
+from bson import ObjectId
+
+from app.core.constants import ROLE_ADMIN
+from app.core.profiling import (
+    PROFILE_CPROFILE,
+    PROFILE_MODES,
+    active_profile,
+    begin_profile,
+    end_profile,
+)
+from app.core.security import get_active_user, read_token_payload
+from app.services.profile_service import save_profile_async
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+
+def _requested_mode(scope):
+    """
+    Profile mode asked for with an ``X-Profile`` header or a ``profile``
+    query parameter (cprofile or sample; any other value means cprofile).
+    """
+    value = None
+    for name, header_value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            value = header_value.decode("latin-1")
+            break
+
+    if value is None and b"profile=" in scope["query_string"]:
+        values = parse_qs(scope["query_string"].decode("latin-1")).get("profile")
+        value = values[0] if values else None
+
+    if not value:
+        return None
+    value = value.strip().lower()
+    return value if value in PROFILE_MODES else PROFILE_CPROFILE
+
+
+async def _admin_user_id(scope):
+    """
+    ID of the active ADMIN behind the request's bearer token, resolved
+    like get_current_user does, so a deactivated admin's token can't
+    turn profiling on.
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            payload = read_token_payload(token)
+            if not payload or not payload.get("user_id"):
+                return None
+            user = await get_active_user(payload["user_id"])
+            if user and user.get("role") == ROLE_ADMIN:
+                return user["_id"]
+            return None
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request when an ADMIN asks for it. The profile is
+    stored in request_profiles and its ID returned in ``X-Profile-Id``;
+    requests without the flag only pay for the header/query check.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = _requested_mode(scope)
+        requested_by = await _admin_user_id(scope) if mode else None
+        if requested_by is None:
+            await self.app(scope, receive, send)
+            return
+
+        session = begin_profile(mode)
+        profile_id = ObjectId()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = (
+                    (b"x-profile-id", str(profile_id).encode())
+                    if session else (b"x-profile", b"busy")
+                )
+                message["headers"] = list(message.get("headers", [])) + [header]
+            await send(message)
+
+        if session is None:
+            # Another profile is running; serve the request unprofiled
+            await self.app(scope, receive, send_wrapper)
+            return
+
+        context_token = active_profile.set(session)
+        thread_token = session.enter_thread()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session.exit_thread(thread_token)
+            active_profile.reset(context_token)
+            end_profile(session)
+
+            route = scope.get("route")
+            try:
+                await save_profile_async(
+                    session,
+                    _id=profile_id,
+                    kind="request",
+                    method=scope["method"],
+                    path=scope["path"],
+                    route=getattr(route, "path", None),
+                    query=scope["query_string"].decode("latin-1"),
+                    status_code=status,
+                    requested_by=requested_by,
+                )
+            except Exception:
+                logger.exception("Could not store profile %s", profile_id)
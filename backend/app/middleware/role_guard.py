@@ -2,7 +2,7 @@ from fastapi import Depends, HTTPException, status
 from app.core.security import get_current_user
 
 def allow_roles(*allowed_roles):
-    def role_checker(user=Depends(get_current_user)):
+    async def role_checker(user=Depends(get_current_user)):
         if user["role"] not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
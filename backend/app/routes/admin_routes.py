@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Query, Request, UploadFile
 from app.middleware.role_guard import allow_roles
+from app.core.profiling import ProfiledRoute
 from app.core.constants import ROLE_ADMIN
-from app.database.mongo import db
+from app.core.http_cache import collection_etag, etag_response, not_modified
+from app.database.mongo import async_db
+from app.database.versions import bump_version_async
 from app.schemas.employee_schema import EmployeeWithUserCreateSchema
 from app.services.employee_service import create_employee_with_user
+from app.services.employee_import_service import import_employees, parse_import_file
 from bson import ObjectId
 from fastapi import HTTPException
 from app.services.employee_service import (
@@ -15,11 +21,12 @@ from app.services.employee_service import get_employee_count
 
 router = APIRouter(
     prefix="/admin",
-    tags=["Admin"]
+    tags=["Admin"],
+    route_class=ProfiledRoute,
 )
 
 @router.get("/dashboard")
-def admin_dashboard(
+async def admin_dashboard(
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
     return {
@@ -27,56 +34,94 @@ def admin_dashboard(
         "user": user["email"]
     }
 
-users_collection = db["users"]
+users_collection = async_db["users"]
 
 # 
 
 @router.get("/employees")
-def get_employees(user=Depends(allow_roles(ROLE_ADMIN))):
-    return list_all_employees()
+async def get_employees(
+    request: Request,
+    department: Optional[str] = None,
+    designation: Optional[str] = None,
+    shift: Optional[str] = None,
+    employment_type: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma separated, e.g. full_name,email"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    etag = await collection_etag(request, "employees")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    # The body stays a plain list; the next page cursor goes in a header
+    rows, next_cursor = await list_all_employees(
+        filters={
+            "department": department,
+            "designation": designation,
+            "shift": shift,
+            "employment_type": employment_type,
+        },
+        fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+        cursor=cursor,
+        limit=limit,
+    )
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return etag_response(rows, etag, headers)
 
 
 @router.put("/employees/{emp_id}")
-def edit_employee(
+async def edit_employee(
     emp_id: str,
     data: dict,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
-    return update_employee(emp_id, data)
+    return await update_employee(emp_id, data)
 
 
 @router.delete("/employees/{emp_id}")
-def remove_employee(
+async def remove_employee(
     emp_id: str,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
-    return delete_employee(emp_id)
+    return await delete_employee(emp_id)
 
 
 @router.post("/create-employee")
-def create_employee(
+async def create_employee(
     data: EmployeeWithUserCreateSchema,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
-    return create_employee_with_user(data)
+    return await create_employee_with_user(data)
+
+@router.post("/employees/import")
+async def bulk_import_employees(
+    file: UploadFile = File(..., description="CSV or JSON array of employees"),
+    dry_run: bool = False,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    rows = parse_import_file(file.filename, await file.read())
+    return await import_employees(rows, dry_run)
 
 @router.get("/stats")
-def admin_stats(user=Depends(allow_roles(ROLE_ADMIN))):
+async def admin_stats(user=Depends(allow_roles(ROLE_ADMIN))):
     return {
-        "total_employees": get_employee_count(),
+        "total_employees": await get_employee_count(),
         "admin_name": user["email"]
     }
 
-departments = db["departments"]
-designations = db["designations"]
+departments = async_db["departments"]
+designations = async_db["designations"]
 
 @router.delete("/departments/{dept_id}")
-def delete_department(
+async def delete_department(
     dept_id: str,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
     # 1️⃣ Find department
-    dept = departments.find_one({"_id": ObjectId(dept_id)})
+    dept = await departments.find_one({"_id": ObjectId(dept_id)})
 
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
@@ -84,35 +129,37 @@ def delete_department(
     dept_code = dept.get("code")
 
     # 2️⃣ Soft delete department
-    departments.update_one(
+    await departments.update_one(
         {"_id": ObjectId(dept_id)},
         {"$set": {"is_active": False}}
     )
 
     # 3️⃣ Soft delete related designations
     if dept_code:
-        designations.update_many(
+        await designations.update_many(
             {"department_code": dept_code},
             {"$set": {"is_active": False}}
         )
 
+    await bump_version_async("departments", "designations")
+
     return {
         "message": "Department and related designations deleted successfully"
     }
 
 from bson import ObjectId
 from fastapi import HTTPException
-from app.database.mongo import db
+from app.database.mongo import async_db
 
-designations = db["designations"]
+designations = async_db["designations"]
 
 @router.delete("/designations/{desig_id}")
-def delete_designation(
+async def delete_designation(
     desig_id: str,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
     try:
-        result = designations.update_one(
+        result = await designations.update_one(
             {"_id": ObjectId(desig_id)},
             {"$set": {"is_active": False}}
         )
@@ -123,14 +170,16 @@ def delete_designation(
     if result.matched_count == 0:
         return {"message": "Designation already deleted"}
 
+    await bump_version_async("designations")
+
     return {"message": "Designation deleted successfully"}
 
 @router.get("/employees/{emp_id}")
-def get_employee_by_id(
+async def get_employee_by_id(
     emp_id: str,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
-    emp = db["employees"].find_one({"_id": ObjectId(emp_id)})
+    emp = await async_db["employees"].find_one({"_id": ObjectId(emp_id)})
 
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
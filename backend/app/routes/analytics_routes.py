@@ -0,0 +1,25 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from app.middleware.role_guard import allow_roles
+from app.core.profiling import ProfiledRoute
+from app.core.constants import ROLE_ADMIN
+from app.services.analytics_service import get_payroll_trends
+
+router = APIRouter(
+    prefix="/admin/analytics",
+    tags=["Analytics"],
+    route_class=ProfiledRoute,
+)
+
+
+@router.get("/payroll")
+async def payroll_trends(
+    start: str = Query(..., alias="from", description="YYYY-MM"),
+    end: str = Query(..., alias="to", description="YYYY-MM"),
+    group_by: str = "department",
+    department: Optional[str] = None,
+    designation: Optional[str] = None,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return await get_payroll_trends(start, end, group_by, department, designation)
@@ -1,37 +1,78 @@
-from fastapi import APIRouter, Depends, UploadFile, File
+import logging
+
+from fastapi import APIRouter, Depends, Query, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
 from app.middleware.role_guard import allow_roles
+from app.core.profiling import ProfiledRoute
 from app.core.constants import ROLE_ADMIN
-from app.schemas.attendance_schema import AttendanceFetchSchema
+from app.core.http_cache import collection_etag, etag_response, not_modified
+from app.schemas.attendance_schema import AttendanceBatchEditSchema, AttendanceFetchSchema
 from app.services.attendance_service import delete_attendance
 from fastapi import APIRouter, Body
-from typing import Dict
+from typing import Dict, Optional
 from app.services.attendance_service import (
-    process_biometric_upload,
     get_attendance_by_employee,
-    fetch_and_process_biometric,
     edit_attendance_manual,
 )
+from app.services.export_service import (
+    parse_export_request,
+    stream_attendance_csv,
+    stream_attendance_ndjson,
+)
+from app.services.upload_archive_service import list_archives
+from app.services.job_service import (
+    submit_upload_job,
+    submit_fetch_job,
+    submit_replay_job,
+    get_job,
+    list_jobs,
+    cancel_job,
+)
 
-router = APIRouter(prefix="/admin/attendance", tags=["Attendance"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/admin/attendance",
+    tags=["Attendance"],
+    route_class=ProfiledRoute,
+)
 
 
 @router.post("/upload")
 def upload(
     file: UploadFile = File(...),
     month: str = "",
+    force: bool = False,
     user=Depends(allow_roles(ROLE_ADMIN)),
 ):
-    return process_biometric_upload(file, month)
+    return submit_upload_job(file, month, user, force)
+
+
+@router.get("/uploads")
+def archived_uploads(
+    month: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    user=Depends(allow_roles(ROLE_ADMIN)),
+):
+    return list_archives(month, limit)
+
+
+@router.post("/uploads/{archive_id}/replay")
+def replay_upload(
+    archive_id: str,
+    user=Depends(allow_roles(ROLE_ADMIN)),
+):
+    return submit_replay_job(archive_id, user)
 
 
 # @router.get("/")
 @router.get("")
-def fetch(
+async def fetch(
     employee_id: str,
     month: str,
     user=Depends(allow_roles(ROLE_ADMIN)),
 ):
-    return get_attendance_by_employee(employee_id, month)
+    return await get_attendance_by_employee(employee_id, month)
 
 
 @router.post("/fetch")
@@ -39,16 +80,77 @@ def fetch_from_biometric(
     data: AttendanceFetchSchema,
     user=Depends(allow_roles(ROLE_ADMIN)),
 ):
-    print("FETCH BIOMETRIC MONTH:", data.month)
-    return fetch_and_process_biometric(data.month)
+    logger.info("Biometric fetch requested for %s by %s", data.month, user["email"])
+    return submit_fetch_job(data.month, user)
+
+
+@router.get("/jobs")
+def ingestion_jobs(
+    user=Depends(allow_roles(ROLE_ADMIN)),
+):
+    return list_jobs()
+
+
+@router.get("/jobs/{job_id}")
+def ingestion_job(
+    job_id: str,
+    user=Depends(allow_roles(ROLE_ADMIN)),
+):
+    return get_job(job_id)
+
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_ingestion_job(
+    job_id: str,
+    user=Depends(allow_roles(ROLE_ADMIN)),
+):
+    return cancel_job(job_id)
 
 @router.get("/monthly-summary")
-def monthly_summary(
+async def monthly_summary(
+    request: Request,
     month: str,
     user=Depends(allow_roles(ROLE_ADMIN)),
 ):
     from app.services.attendance_service import get_monthly_payroll_summary
-    return get_monthly_payroll_summary(month)
+
+    etag = await collection_etag(request, "payroll_monthly")
+    return not_modified(request, etag) or etag_response(
+        await get_monthly_payroll_summary(month), etag
+    )
+
+@router.get("/export")
+def export_month(
+    month: str,
+    format: str = "csv",
+    department: Optional[str] = None,
+    user=Depends(allow_roles(ROLE_ADMIN)),
+):
+    start, end = parse_export_request(month, format)
+
+    if format == "csv":
+        body = stream_attendance_csv(start, end, department)
+        media_type = "text/csv"
+    else:
+        body = stream_attendance_ndjson(start, end, department)
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="attendance-{month}.{format}"'
+        },
+    )
+
+@router.post("/manual-edits")
+def batch_update_attendance(
+    data: AttendanceBatchEditSchema,
+    user=Depends(allow_roles(ROLE_ADMIN)),
+):
+    from app.services.attendance_service import edit_attendance_manual_batch
+
+    return edit_attendance_manual_batch([e.model_dump() for e in data.edits])
 
 @router.put("/{attendance_id}")
 def update_attendance(
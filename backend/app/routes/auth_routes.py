@@ -5,5 +5,5 @@ from app.services.auth_service import authenticate_user
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.post("/login")
-def login(data: LoginSchema):
-    return authenticate_user(data.email, data.password)
+async def login(data: LoginSchema):
+    return await authenticate_user(data.email, data.password)
@@ -0,0 +1,79 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from app.middleware.role_guard import allow_roles
+from app.core.profiling import ProfiledRoute
+from app.core.constants import ROLE_ADMIN
+from app.schemas.calendar_schema import HolidayCreateSchema, WeeklyOffRuleSchema
+from app.services.calendar_service import (
+    create_holiday,
+    delete_holiday,
+    delete_weekly_off_rule,
+    describe_month,
+    list_holidays,
+    list_weekly_off_rules,
+    set_weekly_off_rule,
+)
+
+router = APIRouter(
+    prefix="/admin/calendar",
+    tags=["Calendar"],
+    route_class=ProfiledRoute,
+)
+
+
+@router.get("/weekly-off")
+async def weekly_off_rules(
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return await list_weekly_off_rules()
+
+
+@router.put("/weekly-off")
+async def save_weekly_off_rule(
+    data: WeeklyOffRuleSchema,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return await set_weekly_off_rule(data)
+
+
+@router.delete("/weekly-off/{rule_id}")
+async def remove_weekly_off_rule(
+    rule_id: str,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return await delete_weekly_off_rule(rule_id)
+
+
+@router.get("/holidays")
+async def holidays(
+    year: int,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return await list_holidays(year)
+
+
+@router.post("/holidays")
+async def add_holiday(
+    data: HolidayCreateSchema,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return await create_holiday(data)
+
+
+@router.delete("/holidays/{holiday_id}")
+async def remove_holiday(
+    holiday_id: str,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return await delete_holiday(holiday_id)
+
+
+@router.get("/month")
+def month_calendar(
+    month: str,
+    department: Optional[str] = None,
+    shift: Optional[str] = None,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return describe_month(month, department, shift)
@@ -1,33 +1,38 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from app.middleware.role_guard import allow_roles
+from app.core.profiling import ProfiledRoute
 from app.core.constants import ROLE_ADMIN
+from app.core.http_cache import collection_etag, etag_response, not_modified
 from app.schemas.department_schema import DepartmentCreateSchema
 from app.services.department_service import create_department, list_departments
 from app.services.department_service import update_department
 router = APIRouter(
     prefix="/admin/departments",
-    tags=["Departments"]
+    tags=["Departments"],
+    route_class=ProfiledRoute,
 )
 
 
 @router.post("/")
-def create(
+async def create(
     data: DepartmentCreateSchema,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
-    return create_department(data)
+    return await create_department(data)
 
 
 @router.get("/")
-def list_all(
+async def list_all(
+    request: Request,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
-    return list_departments()
+    etag = await collection_etag(request, "departments")
+    return not_modified(request, etag) or etag_response(await list_departments(), etag)
 
 @router.put("/{dept_id}")
-def update(
+async def update(
     dept_id: str,
     data: dict,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
-    return update_department(dept_id, data)
+    return await update_department(dept_id, data)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from app.middleware.role_guard import allow_roles
+from app.core.profiling import ProfiledRoute
 from app.core.constants import ROLE_ADMIN
+from app.core.http_cache import collection_etag, etag_response, not_modified
 from app.schemas.designation_schema import DesignationCreateSchema
 from app.services.designation_service import (
     create_designation,
@@ -10,29 +12,34 @@ from app.services.designation_service import (
 
 router = APIRouter(
     prefix="/admin/designations",
-    tags=["Designations"]
+    tags=["Designations"],
+    route_class=ProfiledRoute,
 )
 
 
 @router.post("/")
-def create(
+async def create(
     data: DesignationCreateSchema,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
-    return create_designation(data)
+    return await create_designation(data)
 
 
 @router.get("/")
-def list_all(
+async def list_all(
+    request: Request,
     department_code: str = Query(None),
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
-    return list_designations(department_code)
+    etag = await collection_etag(request, "designations")
+    return not_modified(request, etag) or etag_response(
+        await list_designations(department_code), etag
+    )
 
 @router.put("/{desig_id}")
-def update(
+async def update(
     desig_id: str,
     data: dict,
     user=Depends(allow_roles(ROLE_ADMIN))
 ):
-    return update_designation(desig_id, data)
\ No newline at end of file
+    return await update_designation(desig_id, data)
\ No newline at end of file
@@ -9,8 +9,8 @@ router = APIRouter(
 )
 
 @router.get("/me")
-def employee_dashboard(
+async def employee_dashboard(
     user=Depends(allow_roles(ROLE_EMPLOYEE))
 ):
-    return get_my_employee_profile(user)
+    return await get_my_employee_profile(user)
 
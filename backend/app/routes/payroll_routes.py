@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+from app.middleware.role_guard import allow_roles
+from app.core.profiling import ProfiledRoute
+from app.core.constants import ROLE_ADMIN
+from app.schemas.payroll_schema import PayrollSimulationSchema, PayslipGenerateSchema
+from app.services.payroll_engine import simulate_payroll
+from app.services.job_service import submit_payslip_job
+from app.services.payslip_service import get_payslip_path, list_payslips
+
+router = APIRouter(
+    prefix="/admin/payroll",
+    tags=["Payroll"],
+    route_class=ProfiledRoute,
+)
+
+
+@router.post("/simulate")
+def simulate(
+    data: PayrollSimulationSchema,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return simulate_payroll(data)
+
+
+@router.post("/payslips")
+def generate_payslips(
+    data: PayslipGenerateSchema,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    # Runs as an ingestion job; poll /admin/attendance/jobs/{job_id}
+    return submit_payslip_job(data.month, user, data.force)
+
+
+@router.get("/payslips")
+def payslips(
+    month: str,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return list_payslips(month)
+
+
+@router.get("/payslips/{employee_id}")
+def download_payslip(
+    employee_id: str,
+    month: str,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return FileResponse(
+        get_payslip_path(employee_id, month),
+        media_type="text/html",
+        filename=f"payslip-{month}-{employee_id}.html",
+    )
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+from app.middleware.role_guard import allow_roles
+from app.core.constants import ROLE_ADMIN
+from app.services.profile_service import delete_profile, get_profile, list_profiles
+
+router = APIRouter(
+    prefix="/admin/profiles",
+    tags=["Profiling"]
+)
+
+
+@router.get("")
+async def profiles(
+    limit: int = Query(50, ge=1, le=500),
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return await list_profiles(limit)
+
+
+@router.get("/{profile_id}")
+async def profile_report(
+    profile_id: str,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return await get_profile(profile_id)
+
+
+@router.get("/{profile_id}/download")
+async def download_profile(
+    profile_id: str,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    # .prof loads in pstats/snakeviz, .folded in flamegraph.pl/speedscope
+    profile = await get_profile(profile_id, with_data=True)
+    if not profile.get("data"):
+        raise HTTPException(status_code=404, detail="Profile data was too large to keep")
+
+    return Response(
+        bytes(profile["data"]),
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition":
+                f'attachment; filename="profile-{profile_id}.{profile["data_format"]}"'
+        },
+    )
+
+
+@router.delete("/{profile_id}")
+async def remove_profile(
+    profile_id: str,
+    user=Depends(allow_roles(ROLE_ADMIN))
+):
+    return await delete_profile(profile_id)
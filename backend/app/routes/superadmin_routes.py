@@ -3,6 +3,7 @@ from app.middleware.role_guard import allow_roles
 from app.core.constants import ROLE_SUPER_ADMIN
 from app.schemas.user_schema import AdminCreateSchema
 from app.services.user_service import create_admin_user
+from app.core.security import password_hasher, user_cache
 
 router = APIRouter(
     prefix="/superadmin",
@@ -10,11 +11,25 @@ router = APIRouter(
 )
 
 @router.post("/create-admin")
-def create_admin(
+async def create_admin(
     data: AdminCreateSchema,
     user=Depends(allow_roles(ROLE_SUPER_ADMIN))
 ):
-    return create_admin_user(
+    return await create_admin_user(
         email=data.email,
         password=data.password
     )
+
+
+@router.get("/user-cache")
+async def user_cache_stats(
+    user=Depends(allow_roles(ROLE_SUPER_ADMIN))
+):
+    return user_cache.stats()
+
+
+@router.get("/password-hasher")
+async def password_hasher_stats(
+    user=Depends(allow_roles(ROLE_SUPER_ADMIN))
+):
+    return password_hasher.stats()
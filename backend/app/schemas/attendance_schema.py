@@ -1,4 +1,16 @@
-from pydantic import BaseModel
+from typing import List
+
+from pydantic import BaseModel, Field
 
 class AttendanceFetchSchema(BaseModel):
     month: str
+
+
+class AttendanceManualEditSchema(BaseModel):
+    attendance_id: str
+    in_datetime: str
+    out_datetime: str
+
+
+class AttendanceBatchEditSchema(BaseModel):
+    edits: List[AttendanceManualEditSchema] = Field(..., min_length=1, max_length=1000)
@@ -0,0 +1,19 @@
+from datetime import date
+from typing import Annotated, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class WeeklyOffRuleSchema(BaseModel):
+    scope: Literal["DEFAULT", "DEPARTMENT", "SHIFT"]
+    # Department code or shift name; unused for DEFAULT
+    key: Optional[str] = None
+    # Weekdays, Monday = 0 ... Sunday = 6
+    weekly_off: List[Annotated[int, Field(ge=0, le=6)]] = Field(..., max_length=7)
+
+
+class HolidayCreateSchema(BaseModel):
+    date: date
+    name: str
+    # Empty = every department
+    departments: List[str] = []
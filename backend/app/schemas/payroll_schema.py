@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class PayrollSimulationSchema(BaseModel):
+    month: str
+
+    # Overtime is not paid today; opt in to see what paying it would cost
+    pay_overtime: bool = False
+    ot_multiplier: float = Field(1.5, ge=0)
+    ot_grace_minutes: int = Field(0, ge=0)
+
+    # None = current rule (only manual corrections are prorated)
+    prorate_short_days: Optional[bool] = None
+    pay_weekly_off: bool = True
+
+
+class PayslipGenerateSchema(BaseModel):
+    month: str
+
+    # Regenerate every payslip, not only those whose inputs changed
+    force: bool = False
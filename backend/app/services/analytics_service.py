@@ -0,0 +1,237 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.core.dates import parse_month
+from app.database.mongo import async_db, db
+
+payroll_monthly = db["payroll_monthly"]
+payroll_cube = db["payroll_cube"]
+payroll_cube_locks = db["payroll_cube_locks"]
+
+async_payroll_cube = async_db["payroll_cube"]
+
+CUBE_METRICS = ("employees", "present", "absent", "working_days", "ot_minutes", "salary_cost")
+
+GROUP_BY_FIELDS = {
+    "department": ("department",),
+    "designation": ("department", "designation"),
+}
+
+# A month's cube lock is a lease: a holder that died frees it after this
+CUBE_LOCK_LEASE_SECONDS = 60
+CUBE_LOCK_POLL_SECONDS = 0.05
+
+
+# ---------------- REFRESH (WRITE SIDE) ----------------
+
+@contextmanager
+def _cube_month_lock(month: str):
+    """
+    Serializes cube refreshes of one month across processes. Without it
+    a refresh that read older rollups could finish last and overwrite a
+    newer result, or delete a bucket another refresh just filled.
+    """
+    owner = ObjectId()
+    while True:
+        now = datetime.utcnow()
+        try:
+            # Matches a free (expired) lock, otherwise the upsert
+            # collides with the holder's document
+            payroll_cube_locks.find_one_and_update(
+                {"_id": month, "locked_until": {"$lt": now}},
+                {"$set": {
+                    "owner": owner,
+                    "locked_until": now + timedelta(seconds=CUBE_LOCK_LEASE_SECONDS),
+                }},
+                upsert=True,
+            )
+            break
+        except DuplicateKeyError:
+            time.sleep(CUBE_LOCK_POLL_SECONDS)
+
+    try:
+        yield
+    finally:
+        payroll_cube_locks.delete_one({"_id": month, "owner": owner})
+
+
+def refresh_payroll_cube(month: str, buckets: Optional[set] = None):
+    """
+    Re-aggregates the payroll_cube documents of one month from the
+    payroll_monthly rollup: every (department, designation) bucket, or
+    only ``buckets``. Called whenever the rollup changes; refreshes of
+    the same month run one at a time.
+    """
+    if buckets is not None and not buckets:
+        return
+
+    with _cube_month_lock(month):
+        _refresh_payroll_cube(month, buckets)
+
+
+def _refresh_payroll_cube(month: str, buckets: Optional[set]):
+    match = {"month": month}
+    if buckets is not None:
+        match["$or"] = [
+            {"department": department, "designation": designation}
+            for department, designation in buckets
+        ]
+
+    results = payroll_monthly.aggregate([
+        {"$match": match},
+        {
+            "$group": {
+                "_id": {"department": "$department", "designation": "$designation"},
+                "employees": {"$sum": 1},
+                "present": {"$sum": "$present"},
+                "absent": {"$sum": "$absent"},
+                "working_days": {"$sum": "$working_days"},
+                "ot_minutes": {"$sum": "$ot_minutes"},
+                "salary_cost": {"$sum": "$total_salary"},
+            }
+        },
+    ])
+
+    ops = []
+    seen = set()
+    for row in results:
+        key = (row["_id"].get("department"), row["_id"].get("designation"))
+        seen.add(key)
+
+        ops.append(UpdateOne(
+            {"month": month, "department": key[0], "designation": key[1]},
+            {"$set": {
+                **{m: row[m] for m in CUBE_METRICS},
+                "salary_cost": round(row["salary_cost"], 2),
+                "updated_at": datetime.utcnow(),
+            }},
+            upsert=True,
+        ))
+
+    if ops:
+        payroll_cube.bulk_write(ops, ordered=False)
+
+    # Buckets left without any employee this month
+    if buckets is None:
+        stale = {
+            (c.get("department"), c.get("designation"))
+            for c in payroll_cube.find({"month": month}, {"department": 1, "designation": 1})
+        } - seen
+    else:
+        stale = set(buckets) - seen
+
+    if stale:
+        payroll_cube.delete_many({
+            "month": month,
+            "$or": [
+                {"department": department, "designation": designation}
+                for department, designation in stale
+            ],
+        })
+
+
+# ---------------- QUERY (READ SIDE) ----------------
+
+def _empty_metrics():
+    return {m: 0 for m in CUBE_METRICS}
+
+
+def _finish_metrics(metrics: dict):
+    present, absent = metrics["present"], metrics["absent"]
+    return {
+        **metrics,
+        "salary_cost": round(metrics["salary_cost"], 2),
+        "ot_hours": round(metrics["ot_minutes"] / 60, 2),
+        "absenteeism_rate": round(absent / (present + absent), 4) if present + absent else 0.0,
+    }
+
+
+async def get_payroll_trends(
+    start: str,
+    end: str,
+    group_by: str = "department",
+    department: Optional[str] = None,
+    designation: Optional[str] = None,
+):
+    """
+    OT, absenteeism and salary cost per month over [start, end] plus
+    totals over the range and year to date (January of ``end``'s year
+    through ``end``), grouped by department or department + designation.
+    Reads only payroll_cube: one small document per bucket and month.
+    """
+    start_ym = parse_month(start)[:2]
+    end_ym = parse_month(end)[:2]
+    if start_ym > end_ym:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+
+    if group_by not in GROUP_BY_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid group_by, expected one of: {', '.join(GROUP_BY_FIELDS)}"
+        )
+    fields = GROUP_BY_FIELDS[group_by]
+
+    # Zero-padded so months compare as strings
+    start = f"{start_ym[0]:04d}-{start_ym[1]:02d}"
+    end = f"{end_ym[0]:04d}-{end_ym[1]:02d}"
+
+    # One read covers both the requested range and year to date
+    ytd_start = f"{end_ym[0]:04d}-01"
+    query = {"month": {"$gte": min(start, ytd_start), "$lte": end}}
+    if department:
+        query["department"] = department
+    if designation:
+        query["designation"] = designation
+
+    series = {}
+    totals = {}
+    year_to_date = {}
+
+    async for doc in async_payroll_cube.find(query, {"_id": 0, "updated_at": 0}):
+        key = tuple(doc.get(f) for f in fields)
+        month = doc["month"]
+
+        targets = []
+        if month >= start:
+            targets.append(series.setdefault((month, key), _empty_metrics()))
+            targets.append(totals.setdefault(key, _empty_metrics()))
+        if month >= ytd_start:
+            targets.append(year_to_date.setdefault(key, _empty_metrics()))
+
+        for metrics in targets:
+            for m in CUBE_METRICS:
+                metrics[m] += doc.get(m) or 0
+
+    def labelled(key, metrics, **extra):
+        return {**extra, **dict(zip(fields, key)), **_finish_metrics(metrics)}
+
+    def summed(key, metrics):
+        # Headcounts added across months are employee-months
+        row = labelled(key, metrics)
+        row["employee_months"] = row.pop("employees")
+        return row
+
+    def by_key(item):
+        return tuple(str(k or "") for k in item[0])
+
+    return {
+        "from": start,
+        "to": end,
+        "group_by": group_by,
+        "months": [
+            labelled(key, metrics, month=month)
+            for (month, key), metrics in sorted(
+                series.items(),
+                key=lambda item: (item[0][0], by_key((item[0][1],))),
+            )
+        ],
+        "totals": [summed(k, v) for k, v in sorted(totals.items(), key=by_key)],
+        "year_to_date": [summed(k, v) for k, v in sorted(year_to_date.items(), key=by_key)],
+    }
@@ -1,20 +1,40 @@
+import hashlib
 import json
-import io
-import requests
 from bson import ObjectId
 # from datetime import datetime, timedelta
 from datetime import datetime, timedelta, date, time
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
 from calendar import monthrange
+from time import perf_counter
 from fastapi import HTTPException, UploadFile
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
-from app.database.mongo import db
-from app.core.dates import get_all_dates_of_month, is_weekly_off
+from app.core.metrics import (
+    attendance_bulk_writes,
+    attendance_employee_days,
+    attendance_writes,
+    ingestion_duration,
+    payroll_rollup_refreshes,
+    payroll_rollup_writes,
+)
+from app.database.mongo import async_db, db
+from app.database.versions import bump_version
+from app.services.analytics_service import refresh_payroll_cube
+from app.services.biometric_client import BiometricAPIError, get_biometric_client
+from app.services.calendar_service import DAY_HOLIDAY, DAY_WEEKLY_OFF, get_month_calendar
+from app.core.dates import get_all_dates_of_month, get_month_bounds
+from app.utils.json_stream import iter_json_array
 
 employees = db["employees"]
 attendance_daily = db["attendance_daily"]
+payroll_monthly = db["payroll_monthly"]
+
+async_attendance_daily = async_db["attendance_daily"]
+async_payroll_monthly = async_db["payroll_monthly"]
 
 # ---------------- HELPERS ----------------
 
@@ -36,7 +56,7 @@ def minutes_between(start: datetime, end: datetime):
 
 # ---------------- FETCH (EMPLOYEE + MONTH) ----------------
 
-def get_attendance_by_employee(employee_id: str, month: str):
+async def get_attendance_by_employee(employee_id: str, month: str):
     year, mon = map(int, month.split("-"))
 
     start = datetime(year, mon, 1).date().isoformat()
@@ -46,13 +66,13 @@ def get_attendance_by_employee(employee_id: str, month: str):
         else datetime(year, mon + 1, 1).date().isoformat()
     )
 
-    records = attendance_daily.find({
+    records = async_attendance_daily.find({
         "employee_id": ObjectId(employee_id),
         "date": {"$gte": start, "$lt": end},
     }).sort("date", 1)
 
     result = []
-    for r in records:
+    async for r in records:
         r["_id"] = str(r["_id"])
         r["employee_id"] = str(r["employee_id"])
         result.append(r)
@@ -62,46 +82,78 @@ def get_attendance_by_employee(employee_id: str, month: str):
 
 # ---------------- FETCH FROM BIOMETRIC API ----------------
 
-def fetch_and_process_biometric(month: str):
-    year, mon = month.split("-")
-    last_day = monthrange(int(year), int(mon))[1]
-
-    from_date = f"01/{mon}/{year}"
-    to_date = f"{last_day}/{mon}/{year}"
-
-    url = (
-        f"{settings.BIOMETRIC_API_URL}"
-        f"?Empcode=ALL&FromDate={from_date}&ToDate={to_date}"
-    )
-
-    headers = {
-        "Authorization": f"Basic {settings.BIOMETRIC_API_TOKEN}",
-        "Content-Type": "application/json",
-    }
+def fetch_and_process_biometric(
+    month: str,
+    progress: Optional[Callable[[int, int], None]] = None,
+    emp_codes: Optional[List[str]] = None,
+):
+    year, mon = map(int, month.split("-"))
+    last_day = monthrange(year, mon)[1]
+
+    client = get_biometric_client()
+
+    # Only ingest the given codes, but only send them to the API in
+    # bounded batches: without a batch size one request would carry
+    # every code in its query string, so fetch Empcode=ALL and filter.
+    fetch_codes = emp_codes
+    if client.emp_codes_per_window <= 0:
+        fetch_codes = None
+    elif fetch_codes is None:
+        fetch_codes = [
+            str(e["emp_code"]).strip()
+            for e in employees.find(
+                {"is_active": True, "emp_code": {"$nin": [None, ""]}},
+                {"emp_code": 1},
+            )
+        ]
 
-    response = requests.get(url, headers=headers, timeout=30)
+    keep = set(emp_codes) if emp_codes is not None else None
 
-    if response.status_code != 200:
+    # Each window streams straight into the punch collector
+    try:
+        windows = client.fetch(
+            date(year, mon, 1),
+            date(year, mon, last_day),
+            lambda rows: collect_month_punches(rows, year, mon, keep),
+            emp_codes=fetch_codes,
+        )
+    except BiometricAPIError:
         raise HTTPException(status_code=500, detail="Biometric API failed")
 
-    data = response.json()
+    punches = {}
+    row_count = 0
+    for window_punches, window_rows in windows:
+        for key, day_punches in window_punches.items():
+            punches.setdefault(key, []).extend(day_punches)
+        row_count += window_rows
+
+    if not row_count:
+        raise HTTPException(status_code=400, detail="Invalid biometric JSON")
 
-    fake_file = UploadFile(
-        filename="biometric.json",
-        file=io.BytesIO(json.dumps(data).encode()),
+    stats = ingest_biometric_punches(
+        punches,
+        year,
+        mon,
+        progress=progress,
+        emp_codes=emp_codes,
     )
 
-    return process_biometric_upload(fake_file, month)
+    return {
+        "message": "Biometric attendance processed successfully",
+        **stats,
+    }
 
 
 # ---------------- DELETE ATTENDANCE ----------------
 
 def delete_attendance(attendance_id: str):
-    result = attendance_daily.delete_one({"_id": ObjectId(attendance_id)})
+    record = attendance_daily.find_one_and_delete({"_id": ObjectId(attendance_id)})
 
-    if result.deleted_count == 0:
+    if not record:
         raise HTTPException(status_code=404, detail="Attendance not found")
 
+    refresh_payroll_rollup(record["date"][:7], [record["employee_id"]])
+
     return {"message": "Attendance deleted successfully"}
 
 
@@ -123,32 +175,32 @@ def calculate_daily_rate(monthly_salary: float, year: int, month: int):
     total_days = monthrange(year, month)[1]
     return round(monthly_salary / total_days, 2)
 
-def get_monthly_payroll_summary(month: str):
+PRESENT_STATUSES = ["PRESENT_OVERTIME", "PRESENT_COMPLETE", "PRESENT_INCOMPLETE"]
+
+
+def refresh_payroll_rollup(month: str, employee_ids: Optional[list] = None):
+    """
+    Recomputes the payroll_monthly rollup documents for one month,
+    for every employee or only ``employee_ids``, then the payroll_cube
+    buckets they fall in.
+    """
     year, mon = map(int, month.split("-"))
+    start, end = get_month_bounds(year, mon)
 
-    start = datetime(year, mon, 1).date().isoformat()
-    end = (
-        datetime(year + 1, 1, 1).date().isoformat()
-        if mon == 12
-        else datetime(year, mon + 1, 1).date().isoformat()
-    )
+    match = {"date": {"$gte": start, "$lt": end}}
+    if employee_ids is not None:
+        if not employee_ids:
+            return
+        match["employee_id"] = {"$in": list(employee_ids)}
 
     pipeline = [
-        {
-            "$match": {
-                "date": {"$gte": start, "$lt": end}
-            }
-        },
+        {"$match": match},
         {
             "$group": {
                 "_id": "$employee_id",
                 "present": {
                     "$sum": {
-                        "$cond": [
-                            {"$regexMatch": {"input": "$status", "regex": "^PRESENT"}},
-                            1,
-                            0,
-                        ]
+                        "$cond": [{"$in": ["$status", PRESENT_STATUSES]}, 1, 0]
                     }
                 },
                 "absent": {
@@ -162,26 +214,106 @@ def get_monthly_payroll_summary(month: str):
             }
         },
     ]
-
     summary = list(attendance_daily.aggregate(pipeline))
 
-    result = []
+    # Cube buckets the employees were counted in before this refresh
+    buckets = None
+    if employee_ids is not None:
+        buckets = {
+            (r.get("department"), r.get("designation"))
+            for r in payroll_monthly.find(
+                {"month": month, "employee_id": {"$in": list(employee_ids)}},
+                {"department": 1, "designation": 1},
+            )
+        }
+
+    # ---------- EMPLOYEE NAMES (ONE QUERY) ----------
+    emp_map = {
+        e["_id"]: e
+        for e in employees.find(
+            {"_id": {"$in": [row["_id"] for row in summary]}},
+            {"full_name": 1, "emp_code": 1, "department": 1, "designation": 1},
+        )
+    }
+
+    ops = []
+    seen = set()
     for row in summary:
-        emp = employees.find_one({"_id": row["_id"]})
+        emp = emp_map.get(row["_id"])
         if not emp:
             continue
+        seen.add(row["_id"])
+        if buckets is not None:
+            buckets.add((emp.get("department"), emp.get("designation")))
+
+        ops.append(UpdateOne(
+            {"employee_id": row["_id"], "month": month},
+            {"$set": {
+                "employee_id": row["_id"],
+                "month": month,
+                "name": emp.get("full_name"),
+                "emp_code": emp.get("emp_code"),
+                "department": emp.get("department"),
+                "designation": emp.get("designation"),
+                "present": row["present"],
+                "absent": row["absent"],
+                "working_days": row["working_days"],
+                "ot_minutes": row["ot_minutes"],
+                "total_salary": round(row["total_salary"], 2),
+                "updated_at": datetime.utcnow(),
+            }},
+            upsert=True,
+        ))
+
+    payroll_rollup_refreshes.inc(1, "full" if employee_ids is None else "partial")
+    if ops:
+        payroll_monthly.bulk_write(ops, ordered=False)
+        payroll_rollup_writes.inc(len(ops))
+
+    # Employees with no attendance left this month lose their rollup
+    deleted = 0
+    if employee_ids is not None:
+        gone = [e for e in employee_ids if e not in seen]
+        if gone:
+            deleted = payroll_monthly.delete_many(
+                {"month": month, "employee_id": {"$in": gone}}
+            ).deleted_count
+    else:
+        # Full refresh: rollups of employees without attendance are stale
+        deleted = payroll_monthly.delete_many(
+            {"month": month, "employee_id": {"$nin": list(seen)}}
+        ).deleted_count
+
+    if ops or deleted:
+        bump_version("payroll_monthly")
+    refresh_payroll_cube(month, buckets)
+
 
-        result.append({
-            "employee_id": str(emp["_id"]),
-            "name": emp.get("full_name"),
+async def get_monthly_payroll_summary(month: str):
+    rows = await async_payroll_monthly.find(
+        {"month": month}
+    ).sort("name", 1).to_list()
+
+    # First read of a month that was never rolled up
+    if not rows:
+        await run_in_threadpool(refresh_payroll_rollup, month)
+        rows = await async_payroll_monthly.find(
+            {"month": month}
+        ).sort("name", 1).to_list()
+
+    return [
+        {
+            "employee_id": str(row["employee_id"]),
+            "name": row.get("name"),
+            "emp_code": row.get("emp_code"),
             "present": row["present"],
             "absent": row["absent"],
             "working_days": row["working_days"],
             "ot_hours": round(row["ot_minutes"] / 60, 2),
             "total_salary": round(row["total_salary"], 2),
-        })
-
-    return result
+        }
+        for row in rows
+    ]
 
 def minutes_to_hours(m: int):
     return round(m / 60, 2)
@@ -198,6 +330,63 @@ def calculate_ot_amount(ot_minutes: int, hourly_rate: float, multiplier: float =
     return round((ot_minutes / 60) * hourly_rate * multiplier, 2)
 
 
+# ---------------- PUNCH SESSIONS ----------------
+#
+# A day's punches are stored as "punch_minutes": a sorted flat array of
+# minute offsets from the day's midnight, read in pairs
+# [in1, out1, in2, out2, ...]. Offsets past 1440 are overnight.
+
+def minute_offset(day: date, dt: datetime) -> int:
+    return (dt.date() - day).days * 1440 + dt.hour * 60 + dt.minute
+
+
+def compile_day_punches(raw: list) -> Tuple[tuple, tuple]:
+    """
+    Turns a day's raw (in_minute, out_minute) punch rows, either side
+    possibly None, into (punch_minutes, open_punches). IN-only and
+    OUT-only rows are paired in time order; overlapping sessions are
+    merged. Punches left without a partner come back in open_punches.
+    """
+    intervals = []
+    open_ins = []
+    open_outs = []
+    for in_min, out_min in raw:
+        if in_min is not None and out_min is not None:
+            intervals.append((in_min, out_min))
+        elif in_min is not None:
+            open_ins.append(in_min)
+        elif out_min is not None:
+            open_outs.append(out_min)
+
+    # Pair every lone IN with the first lone OUT after it
+    open_outs.sort()
+    unpaired = []
+    for in_min in sorted(open_ins):
+        for i, out_min in enumerate(open_outs):
+            if out_min > in_min:
+                intervals.append((in_min, open_outs.pop(i)))
+                break
+        else:
+            unpaired.append(in_min)
+    unpaired += open_outs
+
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1]:
+            merged[-1] = max(merged[-1], end)
+        else:
+            merged += [start, end]
+
+    return tuple(merged), tuple(sorted(set(unpaired)))
+
+
+def session_minutes(punch_minutes) -> int:
+    return sum(
+        max(0, punch_minutes[i + 1] - punch_minutes[i])
+        for i in range(0, len(punch_minutes) - 1, 2)
+    )
+
+
 def resolve_in_out_datetime(
     record_date: date,
     record: dict,
@@ -206,12 +395,22 @@ def resolve_in_out_datetime(
 ) -> Tuple[Optional[datetime], Optional[datetime]]:
     """
     Hybrid IN/OUT resolver.
-    Supports BOTH:
+    Supports ALL of:
     - old fields: first_in / last_out
-    - new fields: in_datetime / out_datetime
+    - datetime fields: in_datetime / out_datetime
+    - punch sessions: punch_minutes (first IN, last OUT)
     """
 
-    # ---------- NEW DATETIME MODE ----------
+    # ---------- PUNCH SESSION MODE ----------
+    punch_minutes = record.get("punch_minutes")
+    if punch_minutes and len(punch_minutes) >= 2:
+        midnight = datetime.combine(record_date, time.min)
+        return (
+            midnight + timedelta(minutes=punch_minutes[0]),
+            midnight + timedelta(minutes=punch_minutes[-1]),
+        )
+
+    # ---------- DATETIME MODE ----------
     if record.get("in_datetime") and record.get("out_datetime"):
         try:
             return (
@@ -245,23 +444,330 @@ def resolve_in_out_datetime(
 
     return None, None
 
-def process_biometric_upload(file: UploadFile, month: str):
+def build_biometric_day(
+    emp: dict,
+    emp_code: str,
+    d: date,
+    logs: Optional[list],
+    shift_minutes: int,
+    daily_rate: float,
+    day_type: int,
+) -> dict:
+    """
+    Computes the attendance_daily fields for one employee-day from its
+    raw punch rows (see collect_month_punches), or their absence, and
+    the day type from the month calendar.
+    """
+    date_str = d.isoformat()
+    sessions, open_punches = compile_day_punches(logs or [])
+
+    fields = {
+        "employee_id": emp["_id"],
+        "emp_code": emp_code,
+        "date": date_str,
+        "source": "BIOMETRIC",
+    }
+    # Unpaired IN / OUT punches are kept so the day can be fixed by hand
+    if open_punches:
+        fields["open_punches"] = list(open_punches)
+
+    # ---------- HOLIDAY (PAID) ----------
+    if day_type == DAY_HOLIDAY and not sessions:
+        fields.update({
+            "status": "HOLIDAY",
+            "work_minutes": 0,
+            "overtime_minutes": 0,
+            "salary_day_count": 1,
+            "day_salary": daily_rate,
+        })
+        return fields
+
+    # ---------- WEEKLY OFF ----------
+    if day_type == DAY_WEEKLY_OFF and not sessions:
+        fields.update({
+            "status": "WEEKLY_OFF",
+            "work_minutes": 0,
+            "overtime_minutes": 0,
+            "salary_day_count": 1,
+            "day_salary": daily_rate,
+        })
+        return fields
+
+    # ---------- NO COMPLETE SESSION ----------
+    if not sessions:
+        fields.update({
+            "status": "ABSENT",
+            "work_minutes": 0,
+            "overtime_minutes": 0,
+            "salary_day_count": 0,
+            "day_salary": 0,
+        })
+        return fields
+
+    # ---------- VALID BIOMETRIC (ONE OR MORE SESSIONS) ----------
+    midnight = datetime.combine(d, time.min)
+    in_dt = midnight + timedelta(minutes=sessions[0])
+    out_dt = midnight + timedelta(minutes=sessions[-1])
+
+    work_minutes = session_minutes(sessions)
+    overtime_minutes = calculate_overtime(work_minutes, shift_minutes)
+    expected_minutes = shift_minutes
+
+    if work_minutes > expected_minutes:
+        status = "PRESENT_OVERTIME"
+    elif work_minutes == expected_minutes:
+        status = "PRESENT_COMPLETE"
+    else:
+        status = "PRESENT_INCOMPLETE"
+
+    fields.update({
+        "first_in": in_dt.strftime("%H:%M"),
+        "last_out": out_dt.strftime("%H:%M"),
+        "in_datetime": in_dt.isoformat(),
+        "out_datetime": out_dt.isoformat(),
+        "punch_minutes": list(sessions),
+        "work_minutes": work_minutes,
+        "overtime_minutes": overtime_minutes,
+        "status": status,
+        "salary_day_count": 1,
+        "day_salary": daily_rate,
+    })
+    return fields
+
+
+# Written only on days that have them; cleared when a re-ingest drops them
+OPTIONAL_DAY_FIELDS = (
+    "first_in",
+    "last_out",
+    "in_datetime",
+    "out_datetime",
+    "punch_minutes",
+    "open_punches",
+)
+
+
+def day_fingerprint(fields: dict) -> str:
+    """
+    Content hash of a computed attendance day. The fields are derived
+    from the punch pair, the shift length and the salary inputs, so any
+    change in those (or in the rules applied to them) changes the hash.
+    """
+    payload = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+_day_index_verified = False
+
+
+def _require_day_unique_index():
+    """
+    "Manual wins" mid-run relies on the unique (employee_id, date) index:
+    without it an upsert whose filter skips a MANUAL day inserts a
+    second document for that day instead of failing with 11000.
+    """
+    global _day_index_verified
+    if _day_index_verified:
+        return
+
+    for spec in attendance_daily.index_information().values():
+        fields = [field for field, _ in spec["key"]]
+        if spec.get("unique") and fields == ["employee_id", "date"]:
+            _day_index_verified = True
+            return
+
+    raise RuntimeError(
+        "attendance_daily is missing the unique (employee_id, date) index; "
+        "ingestion would duplicate days edited manually. Check the "
+        "ensure_indexes log (duplicate days block the index) and restart."
+    )
+
+
+def _flush_attendance_ops(ops: list, stats: dict):
+    attendance_bulk_writes.inc()
+    attendance_writes.inc(len(ops), "written")
     try:
-        raw = json.loads(file.file.read())
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid JSON file")
+        result = attendance_daily.bulk_write(ops, ordered=False)
+    except BulkWriteError as exc:
+        details = exc.details
+        for err in details.get("writeErrors", []):
+            # The day became MANUAL between the prefetch and this write:
+            # the filter no longer matches and the upsert collides with
+            # the unique (employee_id, date) key. Manual entry wins.
+            if err.get("code") != 11000:
+                raise
+            stats["skipped_manual"] += 1
+
+        stats["inserted"] += details.get("nUpserted", 0)
+        stats["updated"] += details.get("nMatched", 0)
+        return
+
+    stats["inserted"] += result.upserted_count
+    stats["updated"] += result.matched_count
+
+
+def ingest_biometric_punches(
+    punches: dict,
+    year: int,
+    mon: int,
+    chunk_size: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    emp_codes: Optional[List[str]] = None,
+):
+    """
+    Writes a month of biometric attendance for every active employee,
+    or only for ``emp_codes`` when given.
+    ``progress(processed, total)`` is called after each employee.
+
+    Existing records for the month are loaded in one query and the
+    upserts are sent through bulk_write in chunks. Days whose fingerprint
+    matches the stored one are not rewritten. Every update filter
+    excludes MANUAL records, so a manual entry always wins even if it
+    was made while the run was in progress.
+    """
+    _require_day_unique_index()
 
-    punch_data = raw.get("InOutPunchData")
-    if not punch_data:
-        raise HTTPException(status_code=400, detail="Invalid biometric JSON")
+    started = perf_counter()
+    chunk_size = chunk_size or settings.ATTENDANCE_BULK_CHUNK_SIZE
 
-    year, mon = map(int, month.split("-"))
     all_dates = get_all_dates_of_month(year, mon)
+    calendar = get_month_calendar(year, mon)
+    start, end = get_month_bounds(year, mon)
+
+    employee_query = {"is_active": True}
+    existing_query = {"date": {"$gte": start, "$lt": end}}
+    if emp_codes is not None:
+        employee_query["emp_code"] = {"$in": emp_codes}
+        existing_query["emp_code"] = {"$in": emp_codes}
+
+    # ---------- EXISTING RECORDS (ONE QUERY) ----------
+    existing = {
+        (r.get("emp_code"), r["date"]): (r.get("source"), r.get("fingerprint"))
+        for r in attendance_daily.find(
+            existing_query,
+            {"emp_code": 1, "date": 1, "source": 1, "fingerprint": 1},
+        )
+    }
 
-    punches = {}
+    stats = {
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "skipped_manual": 0,
+    }
+    ops = []
+
+    total = employees.count_documents(employee_query)
+    processed = 0
+    scope_ids = []
+    # Employees with queued ops, and those whose ops were sent (maybe
+    # only partly written if the flush failed)
+    batch_ids = set()
+    flushed_ids = set()
+    completed = False
+    month = f"{year:04d}-{mon:02d}"
+
+    try:
+        # ---------- PROCESS EMPLOYEES ----------
+        for emp in employees.find(employee_query):
+            processed += 1
+            if progress:
+                progress(processed, total)
+
+            emp_code = str(emp.get("emp_code", "")).strip()
+            if not emp_code:
+                continue
+            scope_ids.append(emp["_id"])
+
+            shift_minutes = int(emp["total_duty_hours_per_day"] * 60)
+
+            monthly_salary = float(emp.get("salary", 0))
+            daily_rate = calculate_daily_rate(monthly_salary, year, mon)
+            day_types = calendar.day_types(emp.get("department"), emp.get("shift"))
+
+            for d in all_dates:
+                date_str = d.isoformat()
+
+                source, old_fingerprint = existing.get(
+                    (emp_code, date_str), (None, None)
+                )
+
+                # Manual entry always wins
+                if source == "MANUAL":
+                    stats["skipped_manual"] += 1
+                    continue
+
+                fields = build_biometric_day(
+                    emp,
+                    emp_code,
+                    d,
+                    punches.get((emp_code, d)),
+                    shift_minutes,
+                    daily_rate,
+                    day_types[d.day - 1],
+                )
+                fields["fingerprint"] = day_fingerprint(fields)
+
+                # Same punches, shift and salary inputs → nothing to write
+                if fields["fingerprint"] == old_fingerprint:
+                    stats["unchanged"] += 1
+                    continue
+
+                update = {"$set": fields}
+                stale = {f: "" for f in OPTIONAL_DAY_FIELDS if f not in fields}
+                if stale:
+                    update["$unset"] = stale
+
+                batch_ids.add(emp["_id"])
+                ops.append(UpdateOne(
+                    {
+                        "employee_id": emp["_id"],
+                        "date": date_str,
+                        "source": {"$ne": "MANUAL"},
+                    },
+                    update,
+                    upsert=True,
+                ))
+
+                if len(ops) >= chunk_size:
+                    flushed_ids |= batch_ids
+                    batch_ids = set()
+                    _flush_attendance_ops(ops, stats)
+                    ops = []
+
+        if ops:
+            flushed_ids |= batch_ids
+            _flush_attendance_ops(ops, stats)
+        completed = True
+
+    finally:
+        # ---------- PAYROLL ROLLUP ----------
+        # Also after a cancel or failure: whatever reached attendance_daily
+        # must reach payroll_monthly, a re-run may find nothing to write
+        if completed:
+            rolled_up = set(payroll_monthly.distinct("employee_id", {"month": month}))
+            refresh_payroll_rollup(
+                month,
+                [e for e in scope_ids if e in flushed_ids or e not in rolled_up],
+            )
+        else:
+            refresh_payroll_rollup(month, list(flushed_ids))
+
+    stats["changed"] = stats["inserted"] + stats["updated"]
+    stats["elapsed_seconds"] = round(perf_counter() - started, 3)
+
+    attendance_employee_days.inc(len(scope_ids) * len(all_dates))
+    attendance_writes.inc(stats["unchanged"], "unchanged")
+    attendance_writes.inc(stats["skipped_manual"], "skipped_manual")
+    ingestion_duration.observe(perf_counter() - started)
+    return stats
 
-    # ---------- PARSE BIOMETRIC ----------
-    for row in punch_data:
+
+def iter_biometric_punches(rows):
+    """
+    Normalizes InOutPunchData rows into (emp_code, date, in_dt, out_dt).
+    A partial punch ("--:--" or missing) comes through as None.
+    """
+    for row in rows:
         emp_code = str(row.get("Empcode", "")).strip()
         if not emp_code:
             continue
@@ -274,131 +780,91 @@ def process_biometric_upload(file: UploadFile, month: str):
         if not date_str:
             continue
 
-        # Partial or missing punch → IGNORE COMPLETELY
-        if in_time == "--:--" or out_time == "--:--":
-            continue
-
         punch_date = datetime.strptime(date_str, "%d/%m/%Y").date()
-        in_dt = datetime.combine(punch_date, parse_time(in_time))
-        out_dt = datetime.combine(punch_date, parse_time(out_time))
+        in_dt = (
+            datetime.combine(punch_date, parse_time(in_time))
+            if in_time and in_time != "--:--" else None
+        )
+        out_dt = (
+            datetime.combine(punch_date, parse_time(out_time))
+            if out_time and out_time != "--:--" else None
+        )
+
+        # No punch at all
+        if in_dt is None and out_dt is None:
+            continue
 
         # Overnight handling
-        if out_dt < in_dt:
+        if in_dt and out_dt and out_dt < in_dt:
             out_dt += timedelta(days=1)
 
-        punches[(emp_code, punch_date)] = (in_dt, out_dt)
+        yield emp_code, punch_date, in_dt, out_dt
 
-    # ---------- PROCESS EMPLOYEES ----------
-    for emp in employees.find({"is_active": True}):
-        emp_code = str(emp.get("emp_code", "")).strip()
-        if not emp_code:
-            continue
 
-        shift_start = parse_time(str(emp["shift_start_time"]))
-        shift_end = parse_time(str(emp["shift_end_time"]))
-        shift_minutes = int(emp["total_duty_hours_per_day"] * 60)
-
-        monthly_salary = float(emp.get("salary", 0))
-        daily_rate = calculate_daily_rate(monthly_salary, year, mon)
+def collect_month_punches(
+    rows,
+    year: int,
+    mon: int,
+    emp_codes: Optional[set] = None,
+):
+    """
+    Folds punch rows into {(emp_code, date): [(in_minute, out_minute)]}
+    for one month, keeping every row of a day (sessions, breaks,
+    partial punches) as minute offsets. Rows outside the month, or of
+    codes outside ``emp_codes`` when given, are dropped, so the result
+    is bounded by employees x days x punches no matter how large the
+    source is.
+    Returns (punches, row_count).
+    """
+    punches = {}
+    row_count = 0
 
-        for d in all_dates:
-            date_str = d.isoformat()
-            logs = punches.get((emp_code, d))
+    for emp_code, punch_date, in_dt, out_dt in iter_biometric_punches(rows):
+        row_count += 1
+        if punch_date.year != year or punch_date.month != mon:
+            continue
+        if emp_codes is not None and emp_code not in emp_codes:
+            continue
+        punches.setdefault((emp_code, punch_date), []).append((
+            minute_offset(punch_date, in_dt) if in_dt else None,
+            minute_offset(punch_date, out_dt) if out_dt else None,
+        ))
 
-            existing = attendance_daily.find_one({
-                "emp_code": emp_code,
-                "date": date_str,
-            })
+    return punches, row_count
 
-            # Manual entry always wins
-            if existing and existing.get("source") == "MANUAL":
-                continue
 
-            # ---------- WEEKLY OFF ----------
-            if d.weekday() == 6 and not logs:
-                attendance_daily.update_one(
-                    {"employee_id": emp["_id"], "date": date_str},
-                    {"$set": {
-                        "employee_id": emp["_id"],
-                        "emp_code": emp_code,
-                        "date": date_str,
-                        "status": "WEEKLY_OFF",
-                        "work_minutes": 0,
-                        "overtime_minutes": 0,
-                        "salary_day_count": 1,
-                        "day_salary": daily_rate,
-                        "source": "BIOMETRIC",
-                    }},
-                    upsert=True,
-                )
-                continue
+def process_biometric_stream(
+    stream,
+    month: str,
+    progress: Optional[Callable[[int, int], None]] = None,
+):
+    year, mon = map(int, month.split("-"))
 
-            # ---------- NO BIOMETRIC DATA ----------
-            if not logs:
-                attendance_daily.update_one(
-                    {"employee_id": emp["_id"], "date": date_str},
-                    {"$set": {
-                        "employee_id": emp["_id"],
-                        "emp_code": emp_code,
-                        "date": date_str,
-                        "status": "ABSENT",
-                        "work_minutes": 0,
-                        "overtime_minutes": 0,
-                        "salary_day_count": 0,
-                        "day_salary": 0,
-                        "source": "BIOMETRIC",
-                    }},
-                    upsert=True,
-                )
-                continue
+    # ---------- PARSE BIOMETRIC (STREAMING) ----------
+    try:
+        rows = iter_json_array(stream, "InOutPunchData")
+        punches, row_count = collect_month_punches(rows, year, mon)
+    except KeyError:
+        raise HTTPException(status_code=400, detail="Invalid biometric JSON")
+    except (ValueError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid JSON file")
 
-            # ---------- VALID BIOMETRIC (IN + OUT) ----------
-            in_dt, out_dt = logs
+    if not row_count:
+        raise HTTPException(status_code=400, detail="Invalid biometric JSON")
 
-            work_minutes = minutes_between(in_dt, out_dt)
-            overtime_minutes = calculate_overtime(work_minutes, shift_minutes)
-            expected_minutes = shift_minutes
+    stats = ingest_biometric_punches(punches, year, mon, progress=progress)
 
-            if work_minutes > expected_minutes:
-                status = "PRESENT_OVERTIME"
-            elif work_minutes == expected_minutes:
-                status = "PRESENT_COMPLETE"
-            else:
-                status = "PRESENT_INCOMPLETE"
-
-            attendance_daily.update_one(
-                {"employee_id": emp["_id"], "date": date_str},
-                {"$set": {
-                    "employee_id": emp["_id"],
-                    "emp_code": emp_code,
-                    "date": date_str,
-                    "first_in": in_dt.strftime("%H:%M"),
-                    "last_out": out_dt.strftime("%H:%M"),
-                    "in_datetime": in_dt.isoformat(),
-                    "out_datetime": out_dt.isoformat(),
-                    "work_minutes": work_minutes,
-                    "overtime_minutes": overtime_minutes,
-                    "status": status,
-                    "salary_day_count": 1,
-                    "day_salary": daily_rate,
-                    "source": "BIOMETRIC",
-                }},
-                upsert=True,
-            )
+    return {
+        "message": "Biometric attendance processed successfully",
+        **stats,
+    }
 
-    return {"message": "Biometric attendance processed successfully"}
 
+def process_biometric_upload(file: UploadFile, month: str):
+    return process_biometric_stream(file.file, month)
 
-def edit_attendance_manual(
-    attendance_id: str,
-    in_datetime: str,
-    out_datetime: str,
-):
-    record = attendance_daily.find_one({"_id": ObjectId(attendance_id)})
-    if not record:
-        raise HTTPException(status_code=404, detail="Attendance not found")
 
-    # ---- Parse datetime ----
+def parse_manual_datetimes(in_datetime: str, out_datetime: str):
     try:
         in_dt = datetime.fromisoformat(in_datetime)
         out_dt = datetime.fromisoformat(out_datetime)
@@ -409,9 +875,23 @@ def edit_attendance_manual(
     if out_dt <= in_dt:
         out_dt += timedelta(days=1)
 
-    emp = employees.find_one({"_id": record["employee_id"]})
-    if not emp:
-        raise HTTPException(status_code=404, detail="Employee not found")
+    return in_dt, out_dt
+
+
+def build_manual_day(record: dict, emp: dict, in_dt: datetime, out_dt: datetime) -> dict:
+    """
+    The $set/$unset update that turns ``record`` into a MANUAL day. IN
+    must fall on the record's date and OUT before the end of the next
+    day (overnight shifts); punch_minutes are offsets from that date.
+    """
+    record_date = date.fromisoformat(record["date"])
+    in_minute = minute_offset(record_date, in_dt)
+    out_minute = minute_offset(record_date, out_dt)
+    if not 0 <= in_minute < 1440 or not in_minute <= out_minute < 2880:
+        raise HTTPException(
+            status_code=400,
+            detail=f"In/out times must fall on {record['date']} (out may run into the next day)"
+        )
 
     shift_minutes = int(emp["total_duty_hours_per_day"] * 60)
     monthly_salary = float(emp.get("salary", 0))
@@ -451,20 +931,153 @@ def edit_attendance_manual(
     else:
         day_salary = daily_rate
 
-    attendance_daily.update_one(
-        {"_id": ObjectId(attendance_id)},
-        {"$set": {
+    return {
+        "$set": {
             "first_in": in_dt.strftime("%H:%M"),
             "last_out": out_dt.strftime("%H:%M"),
             "in_datetime": in_dt.isoformat(),
             "out_datetime": out_dt.isoformat(),
+            # A manual correction replaces every biometric session of the day
+            "punch_minutes": [in_minute, out_minute],
             "work_minutes": work_minutes,
             "overtime_minutes": overtime_minutes,
             "day_salary": round(day_salary, 2),
             "status": status,
             "source": "MANUAL",
             "updated_at": datetime.utcnow(),
-        }},
+        },
+        "$unset": {"open_punches": ""},
+    }
+
+
+def edit_attendance_manual(
+    attendance_id: str,
+    in_datetime: str,
+    out_datetime: str,
+):
+    record = attendance_daily.find_one({"_id": ObjectId(attendance_id)})
+    if not record:
+        raise HTTPException(status_code=404, detail="Attendance not found")
+
+    in_dt, out_dt = parse_manual_datetimes(in_datetime, out_datetime)
+
+    emp = employees.find_one({"_id": record["employee_id"]})
+    if not emp:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    attendance_daily.update_one(
+        {"_id": ObjectId(attendance_id)},
+        build_manual_day(record, emp, in_dt, out_dt),
     )
 
+    refresh_payroll_rollup(record["date"][:7], [record["employee_id"]])
+
     return {"message": "Attendance updated manually"}
+
+
+def edit_attendance_manual_batch(edits: list):
+    """
+    Applies many manual corrections at once: the referenced records and
+    their employees are loaded with one query each and every update goes
+    out in a single bulk_write. Returns a result per edit; a bad edit
+    doesn't block the others.
+    """
+    results = [
+        {"attendance_id": e["attendance_id"], "status": "FAILED", "error": None}
+        for e in edits
+    ]
+
+    # ---------- VALIDATE IDS ----------
+    oids = {}
+    seen = set()
+    for i, edit in enumerate(edits):
+        if edit["attendance_id"] in seen:
+            results[i]["error"] = "Duplicate attendance_id in batch"
+            continue
+        seen.add(edit["attendance_id"])
+
+        try:
+            oids[i] = ObjectId(edit["attendance_id"])
+        except Exception:
+            results[i]["error"] = "Invalid attendance ID"
+
+    # ---------- PREFETCH (TWO QUERIES) ----------
+    records = {
+        r["_id"]: r
+        for r in attendance_daily.find(
+            {"_id": {"$in": list(oids.values())}},
+            {"employee_id": 1, "date": 1},
+        )
+    }
+    emp_map = {
+        e["_id"]: e
+        for e in employees.find(
+            {"_id": {"$in": list({r["employee_id"] for r in records.values()})}},
+            {"total_duty_hours_per_day": 1, "salary": 1},
+        )
+    }
+
+    # ---------- COMPUTE ----------
+    ops = []
+    op_items = []
+    for i, oid in oids.items():
+        record = records.get(oid)
+        if not record:
+            results[i]["error"] = "Attendance not found"
+            continue
+
+        emp = emp_map.get(record["employee_id"])
+        if not emp:
+            results[i]["error"] = "Employee not found"
+            continue
+
+        try:
+            in_dt, out_dt = parse_manual_datetimes(
+                edits[i]["in_datetime"], edits[i]["out_datetime"]
+            )
+        except HTTPException as exc:
+            results[i]["error"] = exc.detail
+            continue
+
+        try:
+            update = build_manual_day(record, emp, in_dt, out_dt)
+        except HTTPException as exc:
+            results[i]["error"] = exc.detail
+            continue
+        except (KeyError, TypeError, ValueError):
+            results[i]["error"] = "Employee record has no duty hours or salary"
+            continue
+
+        ops.append(UpdateOne({"_id": oid}, update))
+        op_items.append(i)
+
+    # ---------- WRITE (ONE BULK) ----------
+    failed_ops = {}
+    if ops:
+        try:
+            attendance_daily.bulk_write(ops, ordered=False)
+        except BulkWriteError as exc:
+            failed_ops = {
+                err["index"]: err.get("errmsg", "Write failed")
+                for err in exc.details.get("writeErrors", [])
+            }
+
+    months = {}
+    for op_index, i in enumerate(op_items):
+        if op_index in failed_ops:
+            results[i]["error"] = failed_ops[op_index]
+            continue
+        results[i]["status"] = "UPDATED"
+        record = records[oids[i]]
+        months.setdefault(record["date"][:7], set()).add(record["employee_id"])
+
+    # ---------- PAYROLL ROLLUP (ONE REFRESH PER MONTH) ----------
+    for month, employee_ids in months.items():
+        refresh_payroll_rollup(month, list(employee_ids))
+
+    updated = sum(1 for r in results if r["status"] == "UPDATED")
+    return {
+        "updated": updated,
+        "failed": len(results) - updated,
+        "results": results,
+    }
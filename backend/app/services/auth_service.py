@@ -1,17 +1,17 @@
 from bson import ObjectId
 from fastapi import HTTPException, status
-from app.database.mongo import users_collection
-from app.core.security import verify_password, create_access_token
+from app.database.mongo import async_users_collection
+from app.core.security import verify_password_async, create_access_token
 
-def authenticate_user(email: str, password: str):
-    user = users_collection.find_one({"email": email, "is_active": True})
+async def authenticate_user(email: str, password: str):
+    user = await async_users_collection.find_one({"email": email, "is_active": True})
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
 
-    if not verify_password(password, user["password"]):
+    if not await verify_password_async(password, user["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
@@ -0,0 +1,190 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.utils.json_stream import iter_json_array
+
+
+class BiometricAPIError(Exception):
+    pass
+
+
+class BiometricClient:
+    """
+    Pooled client for the biometric punch API.
+
+    A date range (and optionally a list of employee codes) is split into
+    windows that are fetched concurrently over one pooled session. Each
+    response body is streamed straight into the caller's consumer as
+    InOutPunchData rows, without building or re-encoding the JSON.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        token: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        window_days: Optional[int] = None,
+        emp_codes_per_window: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+    ):
+        self.base_url = base_url or settings.BIOMETRIC_API_URL
+        self.timeout = timeout or settings.BIOMETRIC_API_TIMEOUT
+        self.max_workers = max_workers or settings.BIOMETRIC_MAX_WORKERS
+        self.window_days = window_days or settings.BIOMETRIC_WINDOW_DAYS
+        self.emp_codes_per_window = (
+            settings.BIOMETRIC_EMP_CODES_PER_WINDOW
+            if emp_codes_per_window is None
+            else emp_codes_per_window
+        )
+        self.max_retries = (
+            settings.BIOMETRIC_MAX_RETRIES
+            if max_retries is None
+            else max_retries
+        )
+        self.retry_backoff = (
+            settings.BIOMETRIC_RETRY_BACKOFF
+            if retry_backoff is None
+            else retry_backoff
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_workers,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Basic {token or settings.BIOMETRIC_API_TOKEN}",
+            "Content-Type": "application/json",
+        })
+
+    def close(self):
+        self.session.close()
+
+    # ---------------- WINDOWS ----------------
+
+    def iter_windows(
+        self,
+        start: date,
+        end: date,
+        emp_codes: Optional[List[str]] = None,
+    ):
+        """
+        Yields (from_date, to_date, empcode_param) covering [start, end].
+        """
+        if emp_codes:
+            size = self.emp_codes_per_window or len(emp_codes)
+            code_batches = [
+                ",".join(emp_codes[i:i + size])
+                for i in range(0, len(emp_codes), size)
+            ]
+        else:
+            code_batches = ["ALL"]
+
+        current = start
+        while current <= end:
+            window_end = min(
+                end,
+                current + timedelta(days=self.window_days - 1),
+            )
+            for codes in code_batches:
+                yield current, window_end, codes
+            current = window_end + timedelta(days=1)
+
+    # ---------------- FETCH ----------------
+
+    def fetch_window(
+        self,
+        from_date: date,
+        to_date: date,
+        empcode: str,
+        consume: Callable,
+    ):
+        """
+        Streams one window into ``consume(rows)`` and returns its result.
+        Connection failures, broken bodies, 429 and 5xx responses are
+        retried with exponential backoff.
+        """
+        url = (
+            f"{self.base_url}"
+            f"?Empcode={empcode}"
+            f"&FromDate={from_date.strftime('%d/%m/%Y')}"
+            f"&ToDate={to_date.strftime('%d/%m/%Y')}"
+        )
+
+        attempt = 0
+        while True:
+            try:
+                with self.session.get(
+                    url,
+                    timeout=self.timeout,
+                    stream=True,
+                ) as response:
+                    if response.status_code == 429 or response.status_code >= 500:
+                        raise requests.HTTPError(
+                            f"Biometric API returned {response.status_code}"
+                        )
+                    if response.status_code != 200:
+                        raise BiometricAPIError(
+                            f"Biometric API returned {response.status_code}"
+                        )
+
+                    response.raw.decode_content = True
+                    try:
+                        rows = iter_json_array(response.raw, "InOutPunchData")
+                        return consume(rows)
+                    except KeyError:
+                        return consume(iter(()))
+                    except ValueError as exc:
+                        raise BiometricAPIError(
+                            f"Invalid biometric response: {exc}"
+                        )
+
+            except (requests.RequestException, urllib3.exceptions.HTTPError) as exc:
+                if attempt >= self.max_retries:
+                    raise BiometricAPIError(str(exc))
+                time.sleep(self.retry_backoff * (2 ** attempt))
+                attempt += 1
+
+    def fetch(
+        self,
+        start: date,
+        end: date,
+        consume: Callable,
+        emp_codes: Optional[List[str]] = None,
+    ) -> list:
+        """
+        Fetches every window of [start, end] concurrently and returns the
+        list of ``consume`` results, one per window.
+        """
+        windows = list(self.iter_windows(start, end, emp_codes))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [
+                pool.submit(self.fetch_window, from_date, to_date, codes, consume)
+                for from_date, to_date, codes in windows
+            ]
+            return [f.result() for f in futures]
+
+
+_client: Optional[BiometricClient] = None
+_client_lock = threading.Lock()
+
+
+def get_biometric_client() -> BiometricClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = BiometricClient()
+        return _client
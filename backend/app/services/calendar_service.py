@@ -0,0 +1,237 @@
+from datetime import date, datetime
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.dates import get_all_dates_of_month, parse_month
+from app.database.mongo import async_db, db
+
+weekly_off_rules = db["calendar_weekly_off"]
+holidays = db["calendar_holidays"]
+
+async_weekly_off_rules = async_db["calendar_weekly_off"]
+async_holidays = async_db["calendar_holidays"]
+
+DAY_WORKING = 0
+DAY_WEEKLY_OFF = 1
+DAY_HOLIDAY = 2
+
+DAY_TYPE_NAMES = {
+    DAY_WORKING: "WORKING",
+    DAY_WEEKLY_OFF: "WEEKLY_OFF",
+    DAY_HOLIDAY: "HOLIDAY",
+}
+
+SCOPE_DEFAULT = "DEFAULT"
+SCOPE_DEPARTMENT = "DEPARTMENT"
+SCOPE_SHIFT = "SHIFT"
+
+# Used until a DEFAULT rule is stored: Sunday only (weekday() == 6)
+DEFAULT_WEEKLY_OFF = (6,)
+
+# (year, month) -> MonthCalendar
+month_calendars = TTLCache(maxsize=48, ttl=settings.CALENDAR_CACHE_TTL_SECONDS)
+
+
+def weekday_mask(weekdays) -> int:
+    """Bit ``n`` set = weekday ``n`` (Monday = 0) is a weekly off."""
+    mask = 0
+    for w in weekdays:
+        mask |= 1 << w
+    return mask
+
+
+class MonthCalendar:
+    """
+    One month of weekly-off rules and holidays, compiled into a day-type
+    array (one byte per day of the month, see DAY_*). Employees sharing
+    the same weekly-off pattern and department share one array.
+    """
+
+    def __init__(self, year: int, month: int, rules: dict, holiday_days: dict):
+        self.year = year
+        self.month = month
+        self.dates = get_all_dates_of_month(year, month)
+        # (scope, key) -> weekday mask
+        self.rules = rules
+        # department or None (all departments) -> set of day indexes
+        self.holiday_days = holiday_days
+        self._compiled = {}
+
+    def weekly_off_mask(self, department: Optional[str], shift: Optional[str]) -> int:
+        # Most specific rule wins: shift, then department, then default
+        for key in ((SCOPE_SHIFT, shift), (SCOPE_DEPARTMENT, department)):
+            if key[1] and key in self.rules:
+                return self.rules[key]
+        return self.rules.get((SCOPE_DEFAULT, None), weekday_mask(DEFAULT_WEEKLY_OFF))
+
+    def day_types(self, department: Optional[str] = None, shift: Optional[str] = None) -> bytes:
+        mask = self.weekly_off_mask(department, shift)
+        key = (mask, department if department in self.holiday_days else None)
+
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            types = bytearray(len(self.dates))
+            for i, d in enumerate(self.dates):
+                if mask >> d.weekday() & 1:
+                    types[i] = DAY_WEEKLY_OFF
+
+            for i in self.holiday_days.get(None, ()):
+                types[i] = DAY_HOLIDAY
+            if key[1] is not None:
+                for i in self.holiday_days[key[1]]:
+                    types[i] = DAY_HOLIDAY
+
+            compiled = self._compiled[key] = bytes(types)
+        return compiled
+
+    def day_type(self, d: date, department: Optional[str] = None, shift: Optional[str] = None) -> int:
+        return self.day_types(department, shift)[d.day - 1]
+
+
+# ---------------- COMPILE / CACHE ----------------
+
+def _load_month_calendar(year: int, month: int) -> MonthCalendar:
+    rules = {}
+    for r in weekly_off_rules.find({"is_active": True}):
+        rules[(r["scope"], r.get("key"))] = weekday_mask(r["weekly_off"])
+
+    prefix = f"{year:04d}-{month:02d}-"
+    holiday_days = {}
+    for h in holidays.find(
+        {"date": {"$gte": prefix + "01", "$lte": prefix + "31"}, "is_active": True},
+        {"date": 1, "departments": 1},
+    ):
+        index = int(h["date"][8:10]) - 1
+        for department in h.get("departments") or [None]:
+            holiday_days.setdefault(department, set()).add(index)
+
+    return MonthCalendar(year, month, rules, holiday_days)
+
+
+def get_month_calendar(year: int, month: int) -> MonthCalendar:
+    """
+    The compiled calendar of a month, cached per process. Calendar
+    edits clear the local cache; other workers pick them up within
+    CALENDAR_CACHE_TTL_SECONDS.
+    """
+    calendar = month_calendars.get((year, month))
+    if calendar is None:
+        calendar = _load_month_calendar(year, month)
+        month_calendars.set((year, month), calendar)
+    return calendar
+
+
+# ---------------- WEEKLY OFF RULES ----------------
+
+def _serialize(doc: dict):
+    doc["_id"] = str(doc["_id"])
+    return doc
+
+
+async def list_weekly_off_rules():
+    return [
+        _serialize(r)
+        async for r in async_weekly_off_rules.find({"is_active": True}).sort(
+            [("scope", 1), ("key", 1)]
+        )
+    ]
+
+
+async def set_weekly_off_rule(data):
+    key = None if data.scope == SCOPE_DEFAULT else data.key
+    if data.scope != SCOPE_DEFAULT and not key:
+        raise HTTPException(
+            status_code=400,
+            detail="key is required for DEPARTMENT and SHIFT rules"
+        )
+
+    await async_weekly_off_rules.update_one(
+        {"scope": data.scope, "key": key},
+        {"$set": {
+            "scope": data.scope,
+            "key": key,
+            "weekly_off": sorted(set(data.weekly_off)),
+            "is_active": True,
+            "updated_at": datetime.utcnow(),
+        }},
+        upsert=True,
+    )
+    month_calendars.clear()
+
+    return {"message": "Weekly off rule saved"}
+
+
+async def delete_weekly_off_rule(rule_id: str):
+    result = await async_weekly_off_rules.delete_one({"_id": ObjectId(rule_id)})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Weekly off rule not found")
+
+    month_calendars.clear()
+    return {"message": "Weekly off rule deleted"}
+
+
+# ---------------- HOLIDAYS ----------------
+
+async def list_holidays(year: int):
+    return [
+        _serialize(h)
+        async for h in async_holidays.find({
+            "date": {"$gte": f"{year:04d}-01-01", "$lte": f"{year:04d}-12-31"},
+            "is_active": True,
+        }).sort("date", 1)
+    ]
+
+
+async def create_holiday(data):
+    date_str = data.date.isoformat()
+    departments = sorted(set(data.departments or []))
+
+    if await async_holidays.find_one({
+        "date": date_str,
+        "departments": departments,
+        "is_active": True,
+    }):
+        raise HTTPException(status_code=400, detail="Holiday already exists")
+
+    await async_holidays.insert_one({
+        "date": date_str,
+        "name": data.name,
+        "departments": departments,
+        "is_active": True,
+        "created_at": datetime.utcnow(),
+    })
+    month_calendars.invalidate((data.date.year, data.date.month))
+
+    return {"message": "Holiday created successfully"}
+
+
+async def delete_holiday(holiday_id: str):
+    holiday = await async_holidays.find_one_and_delete({"_id": ObjectId(holiday_id)})
+    if not holiday:
+        raise HTTPException(status_code=404, detail="Holiday not found")
+
+    year, month = map(int, holiday["date"][:7].split("-"))
+    month_calendars.invalidate((year, month))
+    return {"message": "Holiday deleted successfully"}
+
+
+# ---------------- INSPECT ----------------
+
+def describe_month(month: str, department: Optional[str] = None, shift: Optional[str] = None):
+    year, mon, _, _ = parse_month(month)
+    calendar = get_month_calendar(year, mon)
+
+    types = calendar.day_types(department, shift)
+    return {
+        "month": month,
+        "department": department,
+        "shift": shift,
+        "days": [
+            {"date": d.isoformat(), "type": DAY_TYPE_NAMES[t]}
+            for d, t in zip(calendar.dates, types)
+        ],
+    }
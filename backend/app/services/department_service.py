@@ -1,38 +1,40 @@
 from datetime import datetime
 from fastapi import HTTPException
-from app.database.mongo import db
+from app.database.mongo import async_db
+from app.database.versions import bump_version_async
 from bson import ObjectId
-departments = db["departments"]
+departments = async_db["departments"]
 
 
-def create_department(data):
-    if departments.find_one({"code": data.code, "is_active": True}):
+async def create_department(data):
+    if await departments.find_one({"code": data.code, "is_active": True}):
         raise HTTPException(
             status_code=400,
             detail="Department code already exists"
         )
 
-    departments.insert_one({
+    await departments.insert_one({
         "name": data.name,
         "code": data.code.upper(),
         "is_active": True,
         "created_at": datetime.utcnow()
     })
+    await bump_version_async("departments")
 
     return {"message": "Department created successfully"}
 
 
-def list_departments():
+async def list_departments():
     result = []
-    for d in departments.find({"is_active": True}):
+    async for d in departments.find({"is_active": True}):
         d["_id"] = str(d["_id"])
         result.append(d)
     return result
 
-def update_department(dept_id: str, data):
+async def update_department(dept_id: str, data):
     data.pop("_id", None)
 
-    result = departments.update_one(
+    result = await departments.update_one(
         {"_id": ObjectId(dept_id), "is_active": True},
         {"$set": data}
     )
@@ -40,4 +42,5 @@ def update_department(dept_id: str, data):
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Department not found")
 
+    await bump_version_async("departments")
     return {"message": "Department updated successfully"}
\ No newline at end of file
@@ -0,0 +1,269 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.constants import ROLE_EMPLOYEE
+from app.core.security import hash_password_async
+from app.database.mongo import async_db
+from app.database.versions import bump_version_async
+from app.schemas.employee_schema import EmployeeWithUserCreateSchema
+from app.services.employee_service import build_employee_doc
+
+users_collection = async_db["users"]
+employees_collection = async_db["employees"]
+
+IMPORT_CREATED = "CREATED"
+IMPORT_VALID = "VALID"  # dry run: would be created
+IMPORT_FAILED = "FAILED"
+
+
+# ---------------- PARSE ----------------
+
+def parse_import_file(filename: str, content: bytes) -> list:
+    """
+    Rows of a CSV file (header row = schema field names) or of a JSON
+    array / {"employees": [...]} document. Blank CSV cells are left out
+    so optional fields fall back to their defaults.
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+
+    if (filename or "").lower().endswith(".csv"):
+        rows = [
+            {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+    else:
+        try:
+            rows = json.loads(text)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON file")
+        if isinstance(rows, dict):
+            rows = rows.get("employees")
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise HTTPException(
+                status_code=400,
+                detail="Expected a JSON array of employees"
+            )
+
+    if not rows:
+        raise HTTPException(status_code=400, detail="No employees in file")
+    if len(rows) > settings.EMPLOYEE_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.EMPLOYEE_IMPORT_MAX_ROWS} employees per import"
+        )
+    return rows
+
+
+# ---------------- VALIDATE ----------------
+
+def _validation_errors(exc: ValidationError) -> list:
+    return [
+        f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}"
+        for err in exc.errors()
+    ]
+
+
+async def _validate_rows(rows: list, results: list) -> list:
+    """
+    Validates every row against the create schema and checks emails and
+    emp_codes for duplicates inside the file and in the database (one
+    query per collection). Returns [(index, schema)] of the valid rows.
+    """
+    parsed = []
+    for index, row in enumerate(rows):
+        try:
+            parsed.append((index, EmployeeWithUserCreateSchema(**row)))
+        except ValidationError as exc:
+            results[index]["errors"] = _validation_errors(exc)
+
+    emails = {data.email for _, data in parsed}
+    emp_codes = {data.emp_code for _, data in parsed if data.emp_code}
+
+    taken_emails = {
+        u["email"]
+        async for u in users_collection.find(
+            {"email": {"$in": list(emails)}},
+            {"email": 1}
+        )
+    } if emails else set()
+
+    taken_codes = {
+        e["emp_code"]
+        async for e in employees_collection.find(
+            {"emp_code": {"$in": list(emp_codes)}, "is_active": True},
+            {"emp_code": 1}
+        )
+    } if emp_codes else set()
+
+    valid = []
+    seen_emails = set()
+    seen_codes = set()
+    for index, data in parsed:
+        errors = []
+
+        if data.email in taken_emails:
+            errors.append("email: User with this email already exists")
+        elif data.email in seen_emails:
+            errors.append("email: Duplicate email in file")
+
+        if data.emp_code:
+            if data.emp_code in taken_codes:
+                errors.append("emp_code: Employee code already in use")
+            elif data.emp_code in seen_codes:
+                errors.append("emp_code: Duplicate emp_code in file")
+
+        seen_emails.add(data.email)
+        if data.emp_code:
+            seen_codes.add(data.emp_code)
+
+        if errors:
+            results[index]["errors"] = errors
+        else:
+            valid.append((index, data))
+
+    return valid
+
+
+# ---------------- INSERT ----------------
+
+def _failed_indexes(exc: BulkWriteError) -> set:
+    return {err["index"] for err in exc.details.get("writeErrors", [])}
+
+
+async def _delete_users_without_employee(user_ids: list):
+    linked = {
+        e["user_id"]
+        async for e in employees_collection.find(
+            {"user_id": {"$in": [str(u) for u in user_ids]}},
+            {"user_id": 1}
+        )
+    }
+    await users_collection.delete_many(
+        {"_id": {"$in": [u for u in user_ids if str(u) not in linked]}}
+    )
+
+
+async def _insert_batch(batch: list, results: list) -> int:
+    """
+    Hashes the batch's passwords in parallel (bounded by the password
+    hasher pool), then inserts users and employees with one insert_many
+    each. Users whose employee could not be inserted are deleted again,
+    so a failure never leaves a login without an employee record.
+    """
+    hashes = await asyncio.gather(
+        *(hash_password_async(data.password) for _, data in batch)
+    )
+
+    now = datetime.utcnow()
+    users = [
+        {
+            "_id": ObjectId(),
+            "email": data.email,
+            "password": password_hash,
+            "role": ROLE_EMPLOYEE,
+            "is_active": True,
+            "created_at": now,
+        }
+        for (_, data), password_hash in zip(batch, hashes)
+    ]
+
+    failed = set()
+    failed_employees = set()
+    inserted = []
+    employees = []
+    try:
+        try:
+            await users_collection.insert_many(users, ordered=False)
+        except BulkWriteError as exc:
+            failed = _failed_indexes(exc)
+
+        inserted = [i for i in range(len(batch)) if i not in failed]
+        for i in inserted:
+            employee = build_employee_doc(batch[i][1], users[i]["_id"])
+            employee["_id"] = ObjectId()
+            employees.append(employee)
+
+        if employees:
+            try:
+                await employees_collection.insert_many(employees, ordered=False)
+            except BulkWriteError as exc:
+                failed_employees = {inserted[i] for i in _failed_indexes(exc)}
+    except BaseException:
+        # Unknown how far the inserts got (error, cancelled request): undo
+        # every user of the batch that ended up without an employee
+        await _delete_users_without_employee([u["_id"] for u in users])
+        raise
+
+    for i in failed:
+        results[batch[i][0]]["errors"] = ["Could not create user"]
+
+    if failed_employees:
+        await users_collection.delete_many(
+            {"_id": {"$in": [users[i]["_id"] for i in failed_employees]}}
+        )
+
+    created = 0
+    for position, i in enumerate(inserted):
+        result = results[batch[i][0]]
+        if i in failed_employees:
+            result["errors"] = ["Could not create employee"]
+            continue
+        result["status"] = IMPORT_CREATED
+        result["employee_id"] = str(employees[position]["_id"])
+        created += 1
+
+    return created
+
+
+# ---------------- IMPORT ----------------
+
+async def import_employees(rows: list, dry_run: bool = False):
+    """
+    Creates an employee (and login) per row. Returns a per-row report;
+    rows that fail validation or insertion don't stop the others.
+    """
+    results = [
+        {
+            "row": index + 1,
+            "email": row.get("email"),
+            "emp_code": row.get("emp_code"),
+            "status": IMPORT_FAILED,
+            "errors": [],
+        }
+        for index, row in enumerate(rows)
+    ]
+
+    valid = await _validate_rows(rows, results)
+
+    created = 0
+    if dry_run:
+        for index, _ in valid:
+            results[index]["status"] = IMPORT_VALID
+    else:
+        batch_size = settings.EMPLOYEE_IMPORT_BATCH_SIZE
+        try:
+            for start in range(0, len(valid), batch_size):
+                created += await _insert_batch(valid[start:start + batch_size], results)
+        finally:
+            if created:
+                await bump_version_async("employees")
+
+    return {
+        "total": len(rows),
+        "created": created,
+        "failed": sum(1 for r in results if r["status"] == IMPORT_FAILED),
+        "dry_run": dry_run,
+        "results": results,
+    }
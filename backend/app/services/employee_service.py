@@ -1,36 +1,22 @@
 from datetime import datetime, time
 from fastapi import HTTPException, status
 from bson import ObjectId
-from app.database.mongo import db
-from app.core.security import hash_password
+from starlette.concurrency import run_in_threadpool
+from app.database.mongo import async_db
+from app.database.versions import bump_version_async
+from app.core.security import hash_password_async, invalidate_cached_user
 from app.core.constants import ROLE_EMPLOYEE
+from app.services.analytics_service import refresh_payroll_cube
 
-users_collection = db["users"]
-employees_collection = db["employees"]
+users_collection = async_db["users"]
+employees_collection = async_db["employees"]
+payroll_monthly = async_db["payroll_monthly"]
 
 
-# ADMIN → CREATE EMPLOYEE
-def create_employee_with_user(data):
-    if users_collection.find_one({"email": data.email}):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this email already exists"
-        )
-
-    # Create USER
-    user = {
+def build_employee_doc(data, user_id) -> dict:
+    return {
+        "user_id": str(user_id),
         "email": data.email,
-        "password": hash_password(data.password),
-        "role": ROLE_EMPLOYEE,
-        "is_active": True,
-        "created_at": datetime.utcnow()
-    }
-
-    user_result = users_collection.insert_one(user)
-
-    # Create EMPLOYEE
-    employee = {
-        "user_id": str(user_result.inserted_id),
         "full_name": data.full_name,
         "designation": data.designation,
         "department": data.department,
@@ -50,7 +36,32 @@ def create_employee_with_user(data):
         "created_at": datetime.utcnow()
     }
 
-    employees_collection.insert_one(employee)
+
+# ADMIN → CREATE EMPLOYEE
+async def create_employee_with_user(data):
+    if await users_collection.find_one({"email": data.email}):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this email already exists"
+        )
+
+    # Create USER
+    user = {
+        "email": data.email,
+        "password": await hash_password_async(data.password),
+        "role": ROLE_EMPLOYEE,
+        "is_active": True,
+        "created_at": datetime.utcnow()
+    }
+
+    user_result = await users_collection.insert_one(user)
+    invalidate_cached_user(user_result.inserted_id)
+
+    # Create EMPLOYEE
+    await employees_collection.insert_one(
+        build_employee_doc(data, user_result.inserted_id)
+    )
+    await bump_version_async("employees")
 
     return {"message": "Employee created successfully"}
 
@@ -79,51 +90,118 @@ def create_employee_with_user(data):
 #     }
 
 
-def list_all_employees():
-    pipeline = [
-        {
-            "$match": {"is_active": True}
-        },
-        {
-            "$addFields": {
-                "user_obj_id": {"$toObjectId": "$user_id"}
-            }
-        },
-        {
-            "$lookup": {
-                "from": "users",
-                "localField": "user_obj_id",
-                "foreignField": "_id",
-                "as": "user"
-            }
-        },
-        {"$unwind": "$user"},
-        {
-            "$project": {
-                "_id": {"$toString": "$_id"},
-                "full_name": 1,
-                "designation": 1,
-                "department": 1,
-                "employment_type": 1,
-                "emp_code": 1,
-                "salary": 1,
-                "shift": 1,
-                "shift_start_time": 1,
-                "shift_end_time": 1,
-                "total_duty_hours_per_day": 1,
-                "email": "$user.email"
-            }
-        }
-    ]
-
-    return list(employees_collection.aggregate(pipeline))
-
-def update_employee(emp_id: str, data: dict):
+# Fields returned by the employee listing; "email" is denormalized
+# from users at creation time (see migrate_employee_email.py)
+EMPLOYEE_LIST_FIELDS = (
+    "full_name",
+    "designation",
+    "department",
+    "employment_type",
+    "emp_code",
+    "salary",
+    "shift",
+    "shift_start_time",
+    "shift_end_time",
+    "total_duty_hours_per_day",
+    "email",
+)
+
+EMPLOYEE_LIST_FILTERS = ("department", "designation", "shift", "employment_type")
+
+
+async def list_all_employees(
+    filters: dict = None,
+    fields: list = None,
+    cursor: str = None,
+    limit: int = None,
+):
+    """
+    Active employees ordered by _id. With ``limit`` set, returns one page
+    and the cursor (last _id) to pass back for the next one.
+    Returns (employees, next_cursor).
+    """
+    query = {"is_active": True}
+    for key in EMPLOYEE_LIST_FILTERS:
+        if filters and filters.get(key):
+            query[key] = filters[key]
+
+    if cursor:
+        try:
+            query["_id"] = {"$gt": ObjectId(cursor)}
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if fields:
+        unknown = set(fields) - set(EMPLOYEE_LIST_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+    else:
+        fields = EMPLOYEE_LIST_FIELDS
+
+    projection = {f: 1 for f in fields}
+    if "email" in fields:
+        projection["user_id"] = 1
+
+    find_cursor = employees_collection.find(query, projection).sort("_id", 1)
+    if limit:
+        # One extra row tells us whether another page exists
+        find_cursor = find_cursor.limit(limit + 1)
+
+    rows = await find_cursor.to_list()
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = str(rows[-1]["_id"])
+
+    if "email" in fields:
+        await _fill_missing_emails(rows)
+
+    for row in rows:
+        row["_id"] = str(row["_id"])
+        row.pop("user_id", None)
+
+    return rows, next_cursor
+
+
+async def _fill_missing_emails(rows: list):
+    # Employees created before email was denormalized; one batched
+    # _id lookup instead of a per-row join
+    user_ids = {}
+    for row in rows:
+        if "email" not in row and row.get("user_id"):
+            try:
+                user_ids[ObjectId(row["user_id"])] = None
+            except Exception:
+                continue
+
+    if not user_ids:
+        return
+
+    async for u in users_collection.find(
+        {"_id": {"$in": list(user_ids)}},
+        {"email": 1}
+    ):
+        user_ids[u["_id"]] = u.get("email")
+
+    for row in rows:
+        if "email" not in row and row.get("user_id"):
+            try:
+                email = user_ids.get(ObjectId(row["user_id"]))
+            except Exception:
+                continue
+            if email:
+                row["email"] = email
+
+async def update_employee(emp_id: str, data: dict):
     data.pop("_id", None)        
     data.pop("email", None)     
     data.pop("user_id", None)    
 
-    result = employees_collection.update_one(
+    result = await employees_collection.update_one(
         {"_id": ObjectId(emp_id), "is_active": True},
         {"$set": data}
     )
@@ -131,27 +209,66 @@ def update_employee(emp_id: str, data: dict):
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Employee not found")
 
+    # Keep the denormalized name / code / bucket on payroll rollups in sync
+    rollup_fields = {}
+    if "full_name" in data:
+        rollup_fields["name"] = data["full_name"]
+    if "emp_code" in data:
+        rollup_fields["emp_code"] = data["emp_code"]
+    for field in ("department", "designation"):
+        if field in data:
+            rollup_fields[field] = data[field]
+
+    if rollup_fields:
+        # Cube buckets the employee's rollups sit in before the move
+        old_buckets = {}
+        if "department" in data or "designation" in data:
+            async for r in payroll_monthly.find(
+                {"employee_id": ObjectId(emp_id)},
+                {"month": 1, "department": 1, "designation": 1}
+            ):
+                old_buckets[r["month"]] = (r.get("department"), r.get("designation"))
+
+        await payroll_monthly.update_many(
+            {"employee_id": ObjectId(emp_id)},
+            {"$set": rollup_fields}
+        )
+        await bump_version_async("payroll_monthly")
+
+        for month, old_bucket in old_buckets.items():
+            new_bucket = (
+                data.get("department", old_bucket[0]),
+                data.get("designation", old_bucket[1]),
+            )
+            if new_bucket != old_bucket:
+                await run_in_threadpool(
+                    refresh_payroll_cube, month, {old_bucket, new_bucket}
+                )
+
+    await bump_version_async("employees")
+
     return {"message": "Employee updated successfully"}
 
 
-def delete_employee(emp_id: str):
-    employees_collection.update_one(
+async def delete_employee(emp_id: str):
+    employee = await employees_collection.find_one_and_update(
         {"_id": ObjectId(emp_id)},
-        {"$set": {"is_active": False}}
+        {"$set": {"is_active": False}},
+        projection={"user_id": 1}
     )
-    return {"message": "Employee deleted successfully"}
 
-def get_employee_count():
-    return employees_collection.count_documents({"is_active": True})
+    if employee:
+        invalidate_cached_user(employee.get("user_id"))
+        await bump_version_async("employees")
 
-from fastapi import HTTPException, status
-from app.database.mongo import db
+    return {"message": "Employee deleted successfully"}
 
-employees_collection = db["employees"]
+async def get_employee_count():
+    return await employees_collection.count_documents({"is_active": True})
 
 
-def get_my_employee_profile(user):
-    employee = employees_collection.find_one(
+async def get_my_employee_profile(user):
+    employee = await employees_collection.find_one(
         {"user_id": str(user["_id"]), "is_active": True}
     )
 
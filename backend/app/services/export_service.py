@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+
+from fastapi import HTTPException
+
+from app.core.dates import parse_month
+from app.database.mongo import async_db
+
+employees = async_db["employees"]
+attendance_daily = async_db["attendance_daily"]
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+EXPORT_COLUMNS = [
+    "date",
+    "emp_code",
+    "name",
+    "department",
+    "status",
+    "first_in",
+    "last_out",
+    "work_minutes",
+    "overtime_minutes",
+    "salary_day_count",
+    "day_salary",
+    "source",
+]
+
+# Rows per yielded chunk and per cursor batch
+EXPORT_CHUNK_ROWS = 500
+
+
+def parse_export_request(month: str, fmt: str):
+    _, _, start, end = parse_month(month)
+
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format, expected one of: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    return start, end
+
+
+async def _load_employee_directory(department: str = None):
+    """
+    employee _id -> (name, emp_code, department), loaded once so the
+    export never looks employees up per row.
+    """
+    query = {"department": department} if department else {}
+    directory = {}
+
+    async for e in employees.find(
+        query,
+        {"full_name": 1, "emp_code": 1, "department": 1},
+    ):
+        directory[e["_id"]] = (
+            e.get("full_name"),
+            e.get("emp_code"),
+            e.get("department"),
+        )
+
+    return directory
+
+
+async def _iter_export_rows(start: str, end: str, department: str = None):
+    directory = await _load_employee_directory(department)
+
+    query = {"date": {"$gte": start, "$lt": end}}
+    if department:
+        if not directory:
+            return
+        query["employee_id"] = {"$in": list(directory)}
+
+    # date-ordered so the date index serves the sort (no in-memory sort)
+    records = attendance_daily.find(
+        query,
+        {"_id": 0, "employee_id": 1, **{c: 1 for c in EXPORT_COLUMNS}},
+        batch_size=EXPORT_CHUNK_ROWS,
+    ).sort("date", 1)
+
+    async for r in records:
+        name, emp_code, emp_department = directory.get(
+            r.get("employee_id"), (None, r.get("emp_code"), None)
+        )
+        r["employee_id"] = str(r.get("employee_id"))
+        r["name"] = name
+        r["emp_code"] = emp_code or r.get("emp_code")
+        r["department"] = emp_department
+        yield r
+
+
+async def stream_attendance_csv(start: str, end: str, department: str = None):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+
+    pending = 0
+    async for row in _iter_export_rows(start, end, department):
+        writer.writerow(row)
+        pending += 1
+        if pending >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    yield buffer.getvalue()
+
+
+async def stream_attendance_ndjson(start: str, end: str, department: str = None):
+    lines = []
+    async for row in _iter_export_rows(start, end, department):
+        lines.append(json.dumps(row, default=str))
+        if len(lines) >= EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
@@ -0,0 +1,397 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from time import monotonic
+
+from bson import ObjectId
+from fastapi import HTTPException, UploadFile
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.core.dates import parse_month
+from app.core.metrics import job_duration, jobs_finished
+from app.core.profiling import ProfileSession, active_profile
+from app.database.mongo import db
+from app.services.attendance_service import (
+    fetch_and_process_biometric,
+    process_biometric_stream,
+)
+from app.services.payslip_service import generate_month_payslips
+from app.services.profile_service import save_profile
+from app.services.upload_archive_service import (
+    get_archive,
+    open_archive,
+    spool_compressed,
+    store_archive,
+)
+
+ingestion_jobs = db["ingestion_jobs"]
+
+JOB_QUEUED = "QUEUED"
+JOB_RUNNING = "RUNNING"
+JOB_COMPLETED = "COMPLETED"
+JOB_FAILED = "FAILED"
+JOB_CANCELLED = "CANCELLED"
+
+JOB_KIND_UPLOAD = "UPLOAD"
+JOB_KIND_FETCH = "FETCH"
+JOB_KIND_PAYSLIPS = "PAYSLIPS"
+JOB_KIND_REPLAY = "REPLAY"
+
+# Jobs that write a month's attendance_daily records
+ATTENDANCE_JOB_KINDS = (JOB_KIND_UPLOAD, JOB_KIND_REPLAY, JOB_KIND_FETCH)
+
+# How often a running job writes its progress and checks for cancellation
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+# A running job's heartbeat is refreshed this often, well inside the
+# stale window, even while the engine reports no progress
+HEARTBEAT_INTERVAL_SECONDS = settings.INGESTION_JOB_STALE_SECONDS / 4
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.INGESTION_WORKERS,
+    thread_name_prefix="ingestion",
+)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# ---------------- HELPERS ----------------
+
+def _serialize_job(job: dict):
+    job["_id"] = str(job["_id"])
+    if job.get("archive_id"):
+        job["archive_id"] = str(job["archive_id"])
+    job.pop("payload_path", None)
+    return job
+
+
+def _finish_job(job_id: ObjectId, status: str, **fields):
+    ingestion_jobs.update_one(
+        {"_id": job_id},
+        {"$set": {
+            "status": status,
+            "finished_at": datetime.utcnow(),
+            **fields,
+        }},
+    )
+
+
+def _make_progress(job_id: ObjectId):
+    """
+    Progress hook for the ingestion engine. Writes are throttled to one
+    per PROGRESS_INTERVAL_SECONDS; each write also picks up a pending
+    cancellation request.
+    """
+    last_write = 0.0
+
+    def progress(processed: int, total: int):
+        nonlocal last_write
+        now = monotonic()
+        if processed < total and now - last_write < PROGRESS_INTERVAL_SECONDS:
+            return
+        last_write = now
+
+        job = ingestion_jobs.find_one_and_update(
+            {"_id": job_id},
+            {"$set": {
+                "progress": {"processed": processed, "total": total},
+                "heartbeat_at": datetime.utcnow(),
+            }},
+            projection={"cancel_requested": 1},
+        )
+        if job and job.get("cancel_requested"):
+            raise JobCancelled()
+
+    return progress
+
+
+def _start_heartbeat(job_id: ObjectId) -> threading.Event:
+    """
+    Keeps heartbeat_at fresh for the whole run (archive reads, fetches,
+    rollup refreshes) so recovery never takes over a live job. Set the
+    returned event to stop it.
+    """
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(HEARTBEAT_INTERVAL_SECONDS):
+            try:
+                ingestion_jobs.update_one(
+                    {"_id": job_id, "status": JOB_RUNNING},
+                    {"$set": {"heartbeat_at": datetime.utcnow()}},
+                )
+            except Exception:
+                pass  # next beat retries
+
+    threading.Thread(target=beat, name=f"heartbeat-{job_id}", daemon=True).start()
+    return stop
+
+
+# ---------------- WORKER ----------------
+
+def run_ingestion_job(job_id: ObjectId):
+    # Claim the job so only one worker ever runs it
+    job = ingestion_jobs.find_one_and_update(
+        {"_id": job_id, "status": JOB_QUEUED},
+        {"$set": {
+            "status": JOB_RUNNING,
+            "started_at": datetime.utcnow(),
+            "heartbeat_at": datetime.utcnow(),
+        }},
+        return_document=ReturnDocument.AFTER,
+    )
+    if not job:
+        return
+
+    heartbeat = _start_heartbeat(job_id)
+    progress = _make_progress(job_id)
+    started = monotonic()
+    status = JOB_FAILED
+
+    # Submitted from a profiled request: profile the job run as well
+    profile = None
+    if job.get("profile"):
+        profile = ProfileSession(job["profile"])
+        profile.start()
+        profile_token = profile.enter_thread()
+
+    try:
+        if job.get("cancel_requested"):
+            raise JobCancelled()
+
+        if job.get("archive_id"):
+            with open_archive(job["archive_id"]) as f:
+                result = process_biometric_stream(f, job["month"], progress)
+        elif job["kind"] == JOB_KIND_UPLOAD:
+            # Queued before uploads were archived
+            with open(job["payload_path"], "rb") as f:
+                result = process_biometric_stream(f, job["month"], progress)
+        elif job["kind"] == JOB_KIND_PAYSLIPS:
+            result = generate_month_payslips(
+                job["month"],
+                force=job.get("force", False),
+                progress=progress,
+            )
+        else:
+            result = fetch_and_process_biometric(job["month"], progress)
+
+    except JobCancelled:
+        status = JOB_CANCELLED
+        _finish_job(job_id, status)
+    except HTTPException as exc:
+        _finish_job(job_id, status, error=exc.detail)
+    except Exception as exc:
+        _finish_job(job_id, status, error=str(exc) or type(exc).__name__)
+    else:
+        status = JOB_COMPLETED
+        _finish_job(job_id, status, result=result)
+    finally:
+        heartbeat.set()
+        jobs_finished.inc(1, job["kind"], status)
+        job_duration.observe(monotonic() - started, job["kind"])
+
+        if profile:
+            profile.exit_thread(profile_token)
+            profile.stop()
+            profile_id = save_profile(
+                profile,
+                kind="job",
+                job_id=str(job_id),
+                job_kind=job["kind"],
+                month=job["month"],
+                requested_by=job.get("created_by"),
+            )
+            ingestion_jobs.update_one(
+                {"_id": job_id}, {"$set": {"profile_id": profile_id}}
+            )
+
+        if job.get("payload_path"):
+            try:
+                os.remove(job["payload_path"])
+            except OSError:
+                pass
+
+
+def _enqueue(job: dict):
+    job.update({
+        "status": JOB_QUEUED,
+        "progress": {"processed": 0, "total": 0},
+        "result": None,
+        "error": None,
+        "cancel_requested": False,
+        "created_at": datetime.utcnow(),
+    })
+
+    session = active_profile.get()
+    if session:
+        job["profile"] = session.mode
+
+    ingestion_jobs.insert_one(job)
+    _executor.submit(run_ingestion_job, job["_id"])
+
+    return {"job_id": str(job["_id"]), "status": JOB_QUEUED}
+
+
+# ---------------- SUBMIT ----------------
+
+def _latest_attendance_job(month: str):
+    return ingestion_jobs.find_one(
+        {
+            "month": month,
+            "kind": {"$in": list(ATTENDANCE_JOB_KINDS)},
+            "status": {"$in": [JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED]},
+        },
+        sort=[("created_at", -1)],
+    )
+
+
+def submit_upload_job(file: UploadFile, month: str, user: dict, force: bool = False):
+    """
+    Archives the upload and queues its ingestion. Re-uploading the file
+    the month was last ingested from returns that job instead, unless
+    ``force`` is set (e.g. after employee or calendar changes).
+    """
+    parse_month(month)
+
+    # The request body is gone once we return: hash and compress it
+    # into the spool dir, then into the archive
+    spool_path, sha256, size = spool_compressed(file.file)
+    try:
+        latest = _latest_attendance_job(month)
+        if not force and latest and latest.get("payload_sha256") == sha256:
+            return {
+                "job_id": str(latest["_id"]),
+                "status": latest["status"],
+                "duplicate": True,
+                "result": latest.get("result"),
+            }
+
+        archive_id = store_archive(
+            spool_path, sha256, month, size, file.filename, user["email"]
+        )
+    finally:
+        os.remove(spool_path)
+
+    return _enqueue({
+        "kind": JOB_KIND_UPLOAD,
+        "month": month,
+        "filename": file.filename,
+        "archive_id": archive_id,
+        "payload_sha256": sha256,
+        "created_by": user["email"],
+    })
+
+
+def submit_replay_job(archive_id: str, user: dict):
+    """Re-runs ingestion from an archived upload."""
+    archive = get_archive(archive_id)
+    meta = archive["metadata"]
+
+    return _enqueue({
+        "kind": JOB_KIND_REPLAY,
+        "month": meta["month"],
+        "filename": meta.get("original_filename"),
+        "archive_id": archive["_id"],
+        "payload_sha256": meta["sha256"],
+        "created_by": user["email"],
+    })
+
+
+def submit_fetch_job(month: str, user: dict):
+    parse_month(month)
+
+    return _enqueue({
+        "kind": JOB_KIND_FETCH,
+        "month": month,
+        "created_by": user["email"],
+    })
+
+
+def submit_payslip_job(month: str, user: dict, force: bool = False):
+    parse_month(month)
+
+    return _enqueue({
+        "kind": JOB_KIND_PAYSLIPS,
+        "month": month,
+        "force": force,
+        "created_by": user["email"],
+    })
+
+
+# ---------------- QUERY / CANCEL ----------------
+
+def get_job(job_id: str):
+    try:
+        job = ingestion_jobs.find_one({"_id": ObjectId(job_id)})
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return _serialize_job(job)
+
+
+def list_jobs(limit: int = 20):
+    return [
+        _serialize_job(job)
+        for job in ingestion_jobs.find().sort("created_at", -1).limit(limit)
+    ]
+
+
+def cancel_job(job_id: str):
+    job = get_job(job_id)
+    oid = ObjectId(job_id)
+
+    if job["status"] == JOB_QUEUED:
+        ingestion_jobs.update_one(
+            {"_id": oid, "status": JOB_QUEUED},
+            {"$set": {
+                "status": JOB_CANCELLED,
+                "cancel_requested": True,
+                "finished_at": datetime.utcnow(),
+            }},
+        )
+    elif job["status"] == JOB_RUNNING:
+        # Picked up by the worker on its next progress write
+        ingestion_jobs.update_one(
+            {"_id": oid},
+            {"$set": {"cancel_requested": True}},
+        )
+    else:
+        raise HTTPException(status_code=400, detail="Job already finished")
+
+    return get_job(job_id)
+
+
+# ---------------- RESTART RECOVERY ----------------
+
+def recover_ingestion_jobs():
+    """
+    Re-queues jobs left behind by a previous process. RUNNING jobs are
+    only taken over once their heartbeat is stale, so jobs still owned
+    by a sibling worker process are left alone.
+    """
+    stale_before = datetime.utcnow() - timedelta(
+        seconds=settings.INGESTION_JOB_STALE_SECONDS
+    )
+
+    ingestion_jobs.update_many(
+        {"status": JOB_RUNNING, "heartbeat_at": {"$lt": stale_before}},
+        {"$set": {"status": JOB_QUEUED}},
+    )
+
+    for job in ingestion_jobs.find({"status": JOB_QUEUED}):
+        if job.get("payload_path") and not os.path.exists(job["payload_path"]):
+            _finish_job(
+                job["_id"],
+                JOB_FAILED,
+                error="Uploaded file was lost during restart",
+            )
+            continue
+
+        _executor.submit(run_ingestion_job, job["_id"])
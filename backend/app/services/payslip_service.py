@@ -0,0 +1,336 @@
+import hashlib
+import json
+import multiprocessing
+import os
+from calendar import monthrange
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from html import escape
+from time import perf_counter
+from typing import Callable, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.dates import parse_month
+from app.core.metrics import payslips_generated
+from app.database.mongo import db
+
+employees = db["employees"]
+attendance_daily = db["attendance_daily"]
+payslips = db["payslips"]
+
+# Bump when the payslip layout changes so every payslip is regenerated
+PAYSLIP_TEMPLATE_VERSION = 2
+
+PAYSLIP_EMPLOYEE_FIELDS = (
+    "full_name",
+    "emp_code",
+    "designation",
+    "department",
+    "employment_type",
+    "salary",
+    "total_duty_hours_per_day",
+)
+
+PAYSLIP_DAY_FIELDS = (
+    "date",
+    "status",
+    "first_in",
+    "last_out",
+    "work_minutes",
+    "overtime_minutes",
+    "salary_day_count",
+    "day_salary",
+    "source",
+)
+
+PRESENT_STATUSES = ("PRESENT_OVERTIME", "PRESENT_COMPLETE", "PRESENT_INCOMPLETE")
+
+
+# ---------------- HELPERS ----------------
+
+def payslip_path(output_dir: str, month: str, employee_id) -> str:
+    return os.path.join(output_dir, month, f"{employee_id}.html")
+
+
+def payslip_input_hash(employee: dict, days: list) -> str:
+    """
+    Fingerprint of everything a payslip is rendered from. Unchanged
+    inputs mean the existing file can be kept.
+    """
+    payload = {
+        "template": PAYSLIP_TEMPLATE_VERSION,
+        "employee": {f: employee.get(f) for f in PAYSLIP_EMPLOYEE_FIELDS},
+        "days": [[d.get(f) for f in PAYSLIP_DAY_FIELDS] for d in days],
+    }
+    return hashlib.sha1(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _hours(minutes) -> str:
+    return f"{(minutes or 0) / 60:.2f}"
+
+
+# ---------------- RENDER ----------------
+
+def render_payslip(employee: dict, month: str, days: list) -> str:
+    year, mon = map(int, month.split("-"))
+
+    present = sum(1 for d in days if d.get("status") in PRESENT_STATUSES)
+    absent = sum(1 for d in days if d.get("status") == "ABSENT")
+    weekly_off = sum(1 for d in days if d.get("status") == "WEEKLY_OFF")
+    holidays = sum(1 for d in days if d.get("status") == "HOLIDAY")
+    working_days = sum(d.get("salary_day_count") or 0 for d in days)
+    work_minutes = sum(d.get("work_minutes") or 0 for d in days)
+    ot_minutes = sum(d.get("overtime_minutes") or 0 for d in days)
+    earned = round(sum(d.get("day_salary") or 0 for d in days), 2)
+
+    def cell(value):
+        return f"<td>{escape(str(value if value is not None else ''))}</td>"
+
+    rows = "\n".join(
+        "<tr>"
+        + cell(d.get("date"))
+        + cell(d.get("status"))
+        + cell(d.get("first_in"))
+        + cell(d.get("last_out"))
+        + cell(_hours(d.get("work_minutes")))
+        + cell(_hours(d.get("overtime_minutes")))
+        + cell(f"{d.get('day_salary') or 0:.2f}")
+        + "</tr>"
+        for d in days
+    )
+
+    summary = [
+        ("Employee", employee.get("full_name")),
+        ("Employee code", employee.get("emp_code")),
+        ("Department", employee.get("department")),
+        ("Designation", employee.get("designation")),
+        ("Employment type", employee.get("employment_type")),
+        ("Monthly salary", f"{float(employee.get('salary') or 0):.2f}"),
+        ("Days in month", monthrange(year, mon)[1]),
+        ("Present", present),
+        ("Absent", absent),
+        ("Weekly off", weekly_off),
+        ("Holidays", holidays),
+        ("Paid days", working_days),
+        ("Hours worked", _hours(work_minutes)),
+        ("Overtime hours", _hours(ot_minutes)),
+        ("Net pay", f"{earned:.2f}"),
+    ]
+    summary_rows = "\n".join(
+        f"<tr><th>{escape(label)}</th>{cell(value)}</tr>"
+        for label, value in summary
+    )
+
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Payslip {escape(month)} - {escape(str(employee.get('full_name') or ''))}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 1.5em; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+</style>
+</head>
+<body>
+<h1>Payslip for {escape(month)}</h1>
+<table>
+{summary_rows}
+</table>
+<table>
+<tr><th>Date</th><th>Status</th><th>In</th><th>Out</th><th>Hours</th><th>OT hours</th><th>Day salary</th></tr>
+{rows}
+</table>
+</body>
+</html>
+"""
+
+
+# ---------------- SHARD (WORKER PROCESS) ----------------
+
+def generate_payslip_shard(
+    month: str,
+    employee_ids: list,
+    previous_hashes: dict,
+    output_dir: str,
+):
+    """
+    Runs in a spawned worker with its own Mongo client. Renders the
+    payslips of ``employee_ids`` whose input hash differs from
+    ``previous_hashes`` (or whose file is missing) and returns the
+    manifest entries for the ones it wrote.
+    """
+    year, mon, start, end = parse_month(month)
+    oids = [ObjectId(e) for e in employee_ids]
+
+    emp_map = {
+        e["_id"]: e
+        for e in employees.find(
+            {"_id": {"$in": oids}},
+            {f: 1 for f in PAYSLIP_EMPLOYEE_FIELDS},
+        )
+    }
+
+    days_by_emp = {}
+    for r in attendance_daily.find(
+        {"employee_id": {"$in": oids}, "date": {"$gte": start, "$lt": end}},
+        {"_id": 0, "employee_id": 1, **{f: 1 for f in PAYSLIP_DAY_FIELDS}},
+    ).sort([("employee_id", 1), ("date", 1)]):
+        days_by_emp.setdefault(r["employee_id"], []).append(r)
+
+    os.makedirs(os.path.join(output_dir, month), exist_ok=True)
+
+    written = []
+    unchanged = 0
+    for emp_id in oids:
+        emp = emp_map.get(emp_id)
+        if not emp:
+            continue  # employee record no longer exists
+
+        days = days_by_emp.get(emp_id, [])
+        input_hash = payslip_input_hash(emp, days)
+        path = payslip_path(output_dir, month, emp_id)
+
+        if previous_hashes.get(str(emp_id)) == input_hash and os.path.exists(path):
+            unchanged += 1
+            continue
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(render_payslip(emp, month, days))
+        os.replace(tmp_path, path)
+
+        written.append({
+            "employee_id": str(emp_id),
+            "input_hash": input_hash,
+            "path": path,
+        })
+
+    return written, unchanged
+
+
+# ---------------- MONTH RUN ----------------
+
+def generate_month_payslips(
+    month: str,
+    workers: Optional[int] = None,
+    force: bool = False,
+    output_dir: Optional[str] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+):
+    """
+    Generates payslips for every employee with attendance in the month,
+    fanned out over a process pool in employee shards. Payslips whose
+    inputs did not change since the last run are skipped unless
+    ``force`` is set.
+    """
+    year, mon, start, end = parse_month(month)
+    output_dir = output_dir or settings.PAYSLIP_OUTPUT_DIR
+    workers = workers or settings.PAYSLIP_WORKERS or os.cpu_count() or 1
+    started = perf_counter()
+
+    employee_ids = sorted(
+        str(e) for e in attendance_daily.distinct(
+            "employee_id", {"date": {"$gte": start, "$lt": end}}
+        )
+    )
+    if not employee_ids:
+        raise HTTPException(status_code=400, detail="No attendance for this month")
+
+    previous_hashes = {}
+    if not force:
+        previous_hashes = {
+            str(p["employee_id"]): p["input_hash"]
+            for p in payslips.find(
+                {"month": month},
+                {"employee_id": 1, "input_hash": 1},
+            )
+        }
+
+    shard_size = settings.PAYSLIP_SHARD_SIZE
+    shards = [
+        employee_ids[i:i + shard_size]
+        for i in range(0, len(employee_ids), shard_size)
+    ]
+
+    stats = {"employees": len(employee_ids), "generated": 0, "unchanged": 0}
+    processed = 0
+
+    pool = ProcessPoolExecutor(
+        max_workers=min(workers, len(shards)),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        futures = {
+            pool.submit(
+                generate_payslip_shard,
+                month,
+                shard,
+                {e: previous_hashes[e] for e in shard if e in previous_hashes},
+                output_dir,
+            ): len(shard)
+            for shard in shards
+        }
+
+        for future in as_completed(futures):
+            written, unchanged = future.result()
+
+            if written:
+                payslips.bulk_write([
+                    UpdateOne(
+                        {"employee_id": ObjectId(w["employee_id"]), "month": month},
+                        {"$set": {
+                            "input_hash": w["input_hash"],
+                            "path": w["path"],
+                            "generated_at": datetime.utcnow(),
+                        }},
+                        upsert=True,
+                    )
+                    for w in written
+                ], ordered=False)
+
+            stats["generated"] += len(written)
+            payslips_generated.inc(len(written))
+            stats["unchanged"] += unchanged
+            processed += futures[future]
+            if progress:
+                progress(processed, len(employee_ids))
+    finally:
+        # On failure or cancellation drop the shards not yet started
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    stats["elapsed_seconds"] = round(perf_counter() - started, 2)
+    return {"message": "Payslips generated", "month": month, **stats}
+
+
+# ---------------- QUERY ----------------
+
+def list_payslips(month: str):
+    parse_month(month)
+    return [
+        {
+            "employee_id": str(p["employee_id"]),
+            "generated_at": p.get("generated_at"),
+        }
+        for p in payslips.find({"month": month}, {"employee_id": 1, "generated_at": 1})
+    ]
+
+
+def get_payslip_path(employee_id: str, month: str) -> str:
+    parse_month(month)
+    try:
+        oid = ObjectId(employee_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid employee ID")
+
+    payslip = payslips.find_one({"employee_id": oid, "month": month}, {"path": 1})
+    if not payslip or not os.path.exists(payslip["path"]):
+        raise HTTPException(status_code=404, detail="Payslip not found")
+
+    return payslip["path"]
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+from bson import Binary, ObjectId
+from fastapi import HTTPException
+
+from app.core.profiling import ProfileSession
+from app.database.mongo import async_db, db
+
+request_profiles = db["request_profiles"]
+async_request_profiles = async_db["request_profiles"]
+
+# Keep documents well under Mongo's 16 MB limit; the text report is
+# still stored when the raw data is dropped
+MAX_PROFILE_DATA_BYTES = 8 * 1024 * 1024
+
+PROFILE_LIST_FIELDS = {
+    "data": 0,
+    "report": 0,
+}
+
+
+# ---------------- HELPERS ----------------
+
+def _parse_profile_id(profile_id: str) -> ObjectId:
+    try:
+        return ObjectId(profile_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid profile ID")
+
+
+def build_profile_doc(session: ProfileSession, **fields) -> dict:
+    report, data, data_format = session.report()
+    if len(data) > MAX_PROFILE_DATA_BYTES:
+        data = b""
+
+    return {
+        **fields,
+        "mode": session.mode,
+        "duration_ms": round(session.elapsed * 1000, 1),
+        "report": report,
+        "data": Binary(data),
+        "data_format": data_format,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _serialize(doc: dict) -> dict:
+    doc["_id"] = str(doc["_id"])
+    return doc
+
+
+# ---------------- WRITE ----------------
+
+def save_profile(session: ProfileSession, **fields) -> str:
+    """Stores a finished session (a background job's); returns its ID."""
+    doc = build_profile_doc(session, **fields)
+    return str(request_profiles.insert_one(doc).inserted_id)
+
+
+async def save_profile_async(session: ProfileSession, **fields) -> str:
+    doc = build_profile_doc(session, **fields)
+    result = await async_request_profiles.insert_one(doc)
+    return str(result.inserted_id)
+
+
+async def delete_profile(profile_id: str):
+    result = await async_request_profiles.delete_one(
+        {"_id": _parse_profile_id(profile_id)}
+    )
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"message": "Profile deleted"}
+
+
+# ---------------- QUERY ----------------
+
+async def list_profiles(limit: int = 50):
+    cursor = async_request_profiles.find({}, PROFILE_LIST_FIELDS).sort(
+        "created_at", -1
+    ).limit(limit)
+    return [_serialize(p) for p in await cursor.to_list()]
+
+
+async def get_profile(profile_id: str, with_data: bool = False):
+    projection = None if with_data else {"data": 0}
+    profile = await async_request_profiles.find_one(
+        {"_id": _parse_profile_id(profile_id)}, projection
+    )
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return _serialize(profile)
@@ -0,0 +1,156 @@
+import gzip
+import hashlib
+import os
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+from gridfs import GridFSBucket
+from gridfs.errors import FileExists, NoFile
+
+from app.core.config import settings
+from app.database.mongo import db
+
+# Raw biometric uploads, gzip-compressed, one file per (sha256, month)
+UPLOAD_ARCHIVE_BUCKET = "upload_archive"
+
+archive_bucket = GridFSBucket(db, bucket_name=UPLOAD_ARCHIVE_BUCKET)
+archive_files = db[f"{UPLOAD_ARCHIVE_BUCKET}.files"]
+
+SPOOL_CHUNK_SIZE = 1024 * 1024
+COMPRESS_LEVEL = 6
+
+
+# ---------------- HELPERS ----------------
+
+def _parse_archive_id(archive_id: str) -> ObjectId:
+    try:
+        return ObjectId(archive_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid archive ID")
+
+
+def _serialize_archive(doc: dict) -> dict:
+    meta = doc.get("metadata") or {}
+    return {
+        "archive_id": str(doc["_id"]),
+        "month": meta.get("month"),
+        "sha256": meta.get("sha256"),
+        "filename": meta.get("original_filename"),
+        "size": meta.get("size"),
+        "compressed_size": doc.get("length"),
+        "uploaded_by": meta.get("uploaded_by"),
+        "uploaded_at": doc.get("uploadDate"),
+    }
+
+
+# ---------------- SPOOL ----------------
+
+def spool_compressed(fileobj):
+    """
+    Copies an upload to a gzip file in the spool dir, hashing the raw
+    bytes on the way. Returns (path, sha256 hex digest, raw size).
+    """
+    os.makedirs(settings.INGESTION_SPOOL_DIR, exist_ok=True)
+    path = os.path.join(settings.INGESTION_SPOOL_DIR, f"{uuid.uuid4().hex}.json.gz")
+
+    digest = hashlib.sha256()
+    size = 0
+    with gzip.open(path, "wb", compresslevel=COMPRESS_LEVEL) as out:
+        while True:
+            chunk = fileobj.read(SPOOL_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+            out.write(chunk)
+
+    return path, digest.hexdigest(), size
+
+
+# ---------------- ARCHIVE ----------------
+
+def find_archive(sha256: str, month: str) -> Optional[dict]:
+    return archive_files.find_one(
+        {"metadata.sha256": sha256, "metadata.month": month}
+    )
+
+
+def store_archive(
+    spool_path: str,
+    sha256: str,
+    month: str,
+    size: int,
+    filename: Optional[str],
+    uploaded_by: str,
+) -> ObjectId:
+    """
+    Archives a spooled (already compressed) upload unless the same
+    payload is archived for the month already; returns the archive ID.
+    """
+    existing = find_archive(sha256, month)
+    if existing:
+        return existing["_id"]
+
+    grid_in = archive_bucket.open_upload_stream(
+        f"{month}-{sha256}.json.gz",
+        metadata={
+            "sha256": sha256,
+            "month": month,
+            "size": size,
+            "original_filename": filename,
+            "uploaded_by": uploaded_by,
+            "encoding": "gzip",
+        },
+    )
+    try:
+        with open(spool_path, "rb") as f:
+            while True:
+                chunk = f.read(SPOOL_CHUNK_SIZE)
+                if not chunk:
+                    break
+                grid_in.write(chunk)
+        grid_in.close()
+    except FileExists:
+        # An identical upload was archived concurrently: the unique
+        # (sha256, month) index refused our files document, so drop the
+        # chunks already written and point at the other archive
+        grid_in.abort()
+        return find_archive(sha256, month)["_id"]
+    except BaseException:
+        grid_in.abort()
+        raise
+
+    return grid_in._id
+
+
+def get_archive(archive_id: str) -> dict:
+    doc = archive_files.find_one({"_id": _parse_archive_id(archive_id)})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Archived upload not found")
+    return doc
+
+
+@contextmanager
+def open_archive(archive_id):
+    """Yields the archived payload as a decompressing binary stream."""
+    try:
+        raw = archive_bucket.open_download_stream(ObjectId(archive_id))
+    except NoFile:
+        raise HTTPException(status_code=404, detail="Archived upload not found")
+
+    try:
+        with gzip.GzipFile(fileobj=raw, mode="rb") as payload:
+            yield payload
+    finally:
+        raw.close()
+
+
+def list_archives(month: Optional[str] = None, limit: int = 50):
+    query = {"metadata.month": month} if month else {}
+    return [
+        _serialize_archive(doc)
+        for doc in archive_files.find(query).sort("uploadDate", -1).limit(limit)
+    ]
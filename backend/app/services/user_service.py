@@ -1,21 +1,22 @@
 from fastapi import HTTPException, status
-from app.database.mongo import users_collection
-from app.core.security import hash_password
+from app.database.mongo import async_users_collection
+from app.core.security import hash_password_async, invalidate_cached_user
 from app.core.constants import ROLE_ADMIN
 
-def create_admin_user(email: str, password: str):
-    if users_collection.find_one({"email": email}):
+async def create_admin_user(email: str, password: str):
+    if await async_users_collection.find_one({"email": email}):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User already exists"
         )
 
-    users_collection.insert_one({
+    result = await async_users_collection.insert_one({
         "email": email,
-        "password": hash_password(password),
+        "password": await hash_password_async(password),
         "role": ROLE_ADMIN,
         "is_active": True
     })
+    invalidate_cached_user(result.inserted_id)
 
     return {
         "message": "Admin created successfully",
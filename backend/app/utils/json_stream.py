@@ -0,0 +1,169 @@
+import codecs
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_STRING_RUN = re.compile(r'[^"\\]*')
+_STRUCTURAL = re.compile(r'["{}\[\],]')
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_ITEM_SIZE = 4 * 1024 * 1024
+
+
+def iter_json_array(
+    stream,
+    key: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_item_size: int = MAX_ITEM_SIZE,
+):
+    """
+    Yields the items of the array stored under ``key`` one by one.
+
+    ``stream`` is read in chunks, so memory is bounded by the largest
+    single item instead of the whole document. Raises KeyError when the
+    key is not present and ValueError when the JSON is malformed.
+    """
+    reader = codecs.getincrementaldecoder("utf-8-sig")()
+    buf = ""
+    eof = False
+
+    def fill():
+        nonlocal buf, eof
+        if eof:
+            return False
+
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            buf += reader.decode(b"", final=True)
+            eof = True
+            return False
+
+        buf += chunk if isinstance(chunk, str) else reader.decode(chunk)
+        return True
+
+    # ---------- LOCATE TOP-LEVEL "key" ----------
+    # Only keys of the top-level object count: the same text as a value
+    # or as a key of a nested object is skipped
+    depth = 0
+    expect_key = False
+    in_string = False
+    string_is_key = False
+    key_parts = []
+    pos = 0
+
+    while True:
+        if pos >= len(buf):
+            buf, pos = "", 0
+            if not fill():
+                if in_string:
+                    raise ValueError("Unterminated JSON string")
+                raise KeyError(key)
+            continue
+
+        if in_string:
+            end = _STRING_RUN.match(buf, pos).end()
+            if string_is_key:
+                key_parts.append(buf[pos:end])
+            pos = end
+            if pos >= len(buf):
+                continue
+
+            if buf[pos] == "\\":
+                if pos + 1 >= len(buf):
+                    buf, pos = buf[pos:], 0
+                    if not fill():
+                        raise ValueError("Unterminated JSON string")
+                    continue
+                if string_is_key:
+                    key_parts.append(buf[pos:pos + 2])
+                pos += 2
+                continue
+
+            # Closing quote
+            pos += 1
+            in_string = False
+            if string_is_key:
+                expect_key = False
+                if json.loads('"' + "".join(key_parts) + '"') == key:
+                    break
+            continue
+
+        match = _STRUCTURAL.search(buf, pos)
+        if not match:
+            pos = len(buf)
+            continue
+
+        char = match.group()
+        pos = match.end()
+        if char == '"':
+            in_string = True
+            string_is_key = depth == 1 and expect_key
+            key_parts = []
+        elif char in "{[":
+            if depth == 0 and char == "[":
+                raise KeyError(key)  # top level is not an object
+            depth += 1
+            expect_key = depth == 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                raise KeyError(key)  # end of the top-level object
+        elif char == "," and depth == 1:
+            expect_key = True
+
+    token = json.dumps(key)
+    for expected in (":", "["):
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if len(buf) - pos >= 4 or not fill():
+                break
+
+        # "key": null → nothing to yield
+        if expected == "[" and buf.startswith("null", pos):
+            return
+
+        if pos >= len(buf) or buf[pos] != expected:
+            raise ValueError(f"Expected '{expected}' after {token}")
+        pos += 1
+
+    # ---------- ITEMS ----------
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE + ",":
+            pos += 1
+
+        if pos >= len(buf):
+            buf, pos = "", 0
+            if not fill():
+                raise ValueError("Unexpected end of JSON array")
+            continue
+
+        if buf[pos] == "]":
+            return
+
+        try:
+            item, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            item, end = None, None
+
+        # A scalar is only complete once a delimiter follows it
+        truncated = end is None or (
+            not eof
+            and not isinstance(item, (dict, list))
+            and (end == len(buf) or buf[end] not in _WHITESPACE + ",]")
+        )
+
+        if truncated:
+            if len(buf) - pos > max_item_size:
+                raise ValueError("JSON array item too large or malformed")
+            buf, pos = buf[pos:], 0
+            if not fill() and end is None:
+                raise ValueError("Malformed JSON array item")
+            continue
+
+        yield item
+
+        pos = end
+        if pos >= chunk_size:
+            buf, pos = buf[pos:], 0
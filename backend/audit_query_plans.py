@@ -0,0 +1,181 @@
+"""
+Runs explain on every query shape used in app/services and flags the
+ones the planner answers with a collection scan.
+
+    python audit_query_plans.py [--ensure-indexes]
+
+Exits with status 1 when any shape falls back to COLLSCAN.
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.database.mongo import db
+
+SAMPLE_ID = ObjectId()
+MONTH_RANGE = {"$gte": "2025-01-01", "$lt": "2025-02-01"}
+
+# (service, collection, command body without the collection name)
+QUERY_SHAPES = [
+    # ---------- auth / security ----------
+    ("auth_service.authenticate_user", "users",
+     {"find": {"email": "a@b.c", "is_active": True}}),
+    ("security.get_current_user", "users",
+     {"find": {"_id": SAMPLE_ID, "is_active": True}}),
+    ("employee_service.create_employee_with_user", "users",
+     {"find": {"email": "a@b.c"}}),
+
+    # ---------- employees ----------
+    ("employee_service.list_all_employees", "employees",
+     {"find": {"is_active": True, "_id": {"$gt": SAMPLE_ID}},
+      "sort": {"_id": 1}}),
+    ("employee_service.list_all_employees (department)", "employees",
+     {"find": {"is_active": True, "department": "HR", "_id": {"$gt": SAMPLE_ID}},
+      "sort": {"_id": 1}}),
+    ("employee_service.list_all_employees (designation)", "employees",
+     {"find": {"is_active": True, "designation": "Clerk"}, "sort": {"_id": 1}}),
+    ("employee_service._fill_missing_emails", "users",
+     {"find": {"_id": {"$in": [SAMPLE_ID]}}}),
+    ("employee_service.get_my_employee_profile", "employees",
+     {"find": {"user_id": str(SAMPLE_ID), "is_active": True}}),
+    ("employee_service.update_employee", "employees",
+     {"find": {"_id": SAMPLE_ID, "is_active": True}}),
+    ("attendance_service.ingest_biometric_punches", "employees",
+     {"find": {"is_active": True, "emp_code": {"$in": ["1001"]}}}),
+    ("attendance_service.fetch_and_process_biometric", "employees",
+     {"find": {"is_active": True, "emp_code": {"$nin": [None, ""]}}}),
+
+    # ---------- attendance ----------
+    ("attendance_service.get_attendance_by_employee", "attendance_daily",
+     {"find": {"employee_id": SAMPLE_ID, "date": MONTH_RANGE},
+      "sort": {"date": 1}}),
+    ("attendance_service.ingest_biometric_punches (prefetch)", "attendance_daily",
+     {"find": {"date": MONTH_RANGE}}),
+    ("attendance_service.ingest_biometric_punches (shard prefetch)", "attendance_daily",
+     {"find": {"date": MONTH_RANGE, "emp_code": {"$in": ["1001"]}}}),
+    ("attendance_service.ingest_biometric_punches (upsert)", "attendance_daily",
+     {"find": {"employee_id": SAMPLE_ID, "date": "2025-01-01",
+               "source": {"$ne": "MANUAL"}}}),
+    ("attendance_service.refresh_payroll_rollup", "attendance_daily",
+     {"aggregate": [{"$match": {"date": MONTH_RANGE,
+                                "employee_id": {"$in": [SAMPLE_ID]}}}]}),
+    ("export_service.stream_attendance_csv", "attendance_daily",
+     {"find": {"date": MONTH_RANGE}, "sort": {"date": 1}}),
+    ("export_service.stream_attendance_csv (department)", "attendance_daily",
+     {"find": {"date": MONTH_RANGE, "employee_id": {"$in": [SAMPLE_ID]}},
+      "sort": {"date": 1}}),
+    ("attendance_service.edit_attendance_manual", "attendance_daily",
+     {"find": {"_id": SAMPLE_ID}}),
+
+    # ---------- payroll rollup ----------
+    ("attendance_service.get_monthly_payroll_summary", "payroll_monthly",
+     {"find": {"month": "2025-01"}, "sort": {"name": 1}}),
+    ("attendance_service.ingest_biometric_punches (rollup)", "payroll_monthly",
+     {"find": {"month": "2025-01"}}),
+
+    # ---------- analytics cube ----------
+    ("analytics_service.refresh_payroll_cube", "payroll_monthly",
+     {"aggregate": [{"$match": {"month": "2025-01", "$or": [
+         {"department": "HR", "designation": "Clerk"}]}}]}),
+    ("analytics_service.get_payroll_trends", "payroll_cube",
+     {"find": {"month": {"$gte": "2025-01", "$lte": "2025-06"}, "department": "HR"}}),
+
+    # ---------- payslips ----------
+    ("payslip_service.generate_month_payslips", "attendance_daily",
+     {"find": {"date": MONTH_RANGE}}),
+    ("payslip_service.generate_payslip_shard", "attendance_daily",
+     {"find": {"employee_id": {"$in": [SAMPLE_ID]}, "date": MONTH_RANGE},
+      "sort": {"employee_id": 1, "date": 1}}),
+    ("payslip_service.get_payslip_path", "payslips",
+     {"find": {"employee_id": SAMPLE_ID, "month": "2025-01"}}),
+
+    # ---------- departments / designations ----------
+    ("department_service.create_department", "departments",
+     {"find": {"code": "HR", "is_active": True}}),
+    ("department_service.list_departments", "departments",
+     {"find": {"is_active": True}}),
+    ("designation_service.create_designation", "designations",
+     {"find": {"name": "Clerk", "department_code": "HR", "is_active": True}}),
+    ("designation_service.list_designations", "designations",
+     {"find": {"is_active": True, "department_code": "HR"}}),
+    ("admin_routes.delete_department", "designations",
+     {"find": {"department_code": "HR"}}),
+
+    # ---------- jobs ----------
+    ("job_service.list_jobs", "ingestion_jobs",
+     {"find": {}, "sort": {"created_at": -1}}),
+    ("job_service.recover_ingestion_jobs", "ingestion_jobs",
+     {"find": {"status": "RUNNING", "heartbeat_at": {"$lt": datetime.utcnow()}}}),
+]
+
+
+def build_command(collection: str, shape: dict):
+    if "aggregate" in shape:
+        return {"aggregate": collection, "pipeline": shape["aggregate"], "cursor": {}}
+
+    command = {"find": collection, "filter": shape["find"]}
+    if "sort" in shape:
+        command["sort"] = shape["sort"]
+    return command
+
+
+def winning_stages(node, inside_plan=False):
+    """
+    Collects every stage name found inside a winningPlan subtree.
+    """
+    stages = []
+    if isinstance(node, dict):
+        if inside_plan and "stage" in node:
+            stages.append(node["stage"])
+        for key, value in node.items():
+            stages += winning_stages(
+                value,
+                inside_plan or key in ("winningPlan", "queryPlan"),
+            )
+    elif isinstance(node, list):
+        for item in node:
+            stages += winning_stages(item, inside_plan)
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query plan audit")
+    parser.add_argument(
+        "--ensure-indexes",
+        action="store_true",
+        help="Apply the index manifest before auditing",
+    )
+    args = parser.parse_args()
+
+    if args.ensure_indexes:
+        from app.database.indexes import ensure_indexes
+        ensure_indexes()
+
+    collscans = 0
+    for service, collection, shape in QUERY_SHAPES:
+        explain = db.command(
+            "explain",
+            build_command(collection, shape),
+            verbosity="queryPlanner",
+        )
+        stages = winning_stages(explain)
+
+        if "COLLSCAN" in stages:
+            collscans += 1
+            verdict = "COLLSCAN"
+        elif "EOF" in stages and not any(s.startswith("IXSCAN") for s in stages):
+            verdict = "EMPTY   "  # collection does not exist yet
+        else:
+            verdict = "ok      "
+
+        print(f"{verdict}  {collection:<20} {service}")
+
+    print(f"\n{len(QUERY_SHAPES)} query shape(s), {collscans} COLLSCAN(s)")
+    if collscans:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Re-runs biometric ingestion over a range of months.
+
+The work is sharded by month and by employee partition and spread over a
+process pool. Every finished shard is checkpointed in Mongo, so running
+the same command again after an interruption only redoes the missing
+shards.
+
+    python backfill_attendance.py --from 2025-01 --to 2025-12 \\
+        --partitions 4 --workers 8 [--emp-codes 101,102] [--restart]
+
+More than one partition requires BIOMETRIC_EMP_CODES_PER_WINDOW > 0, so
+each shard fetches only its own codes from the biometric API.
+"""
+import argparse
+import hashlib
+import multiprocessing
+import sys
+from calendar import monthrange
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from time import perf_counter
+
+SHARD_DONE = "DONE"
+SHARD_EMPTY = "EMPTY"
+SHARD_FAILED = "FAILED"
+
+
+def iter_months(start: str, end: str):
+    year, mon = map(int, start.split("-"))
+    end_year, end_mon = map(int, end.split("-"))
+
+    while (year, mon) <= (end_year, end_mon):
+        yield f"{year:04d}-{mon:02d}"
+        mon += 1
+        if mon > 12:
+            year, mon = year + 1, 1
+
+
+def partition_codes(emp_codes: list, partitions: int):
+    codes = sorted(emp_codes)
+    return [p for p in (codes[i::partitions] for i in range(partitions)) if p]
+
+
+def run_shard(month: str, emp_codes: list):
+    # Runs in a fresh (spawned) process with its own Mongo client
+    from fastapi import HTTPException
+    from app.services.attendance_service import fetch_and_process_biometric
+
+    try:
+        result = fetch_and_process_biometric(month, emp_codes=emp_codes)
+        status = SHARD_DONE
+    except HTTPException as exc:
+        if exc.status_code != 400:
+            raise
+        result = {"detail": exc.detail}
+        status = SHARD_EMPTY
+
+    year, mon = map(int, month.split("-"))
+    employee_days = len(emp_codes) * monthrange(year, mon)[1]
+    return status, result, employee_days
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel attendance backfill")
+    parser.add_argument("--from", dest="start", required=True, help="YYYY-MM")
+    parser.add_argument("--to", dest="end", required=True, help="YYYY-MM")
+    parser.add_argument("--emp-codes", default="", help="Comma separated filter")
+    parser.add_argument("--partitions", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--run-id", help="Defaults to a hash of the arguments")
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore existing checkpoints for this run",
+    )
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    from app.database.mongo import db
+
+    # Without a codes-per-window batch size every shard downloads the
+    # whole month (Empcode=ALL) and keeps only its partition: N
+    # partitions would mean N identical full-month downloads
+    if args.partitions > 1 and settings.BIOMETRIC_EMP_CODES_PER_WINDOW <= 0:
+        sys.exit(
+            "--partitions > 1 needs BIOMETRIC_EMP_CODES_PER_WINDOW > 0 so each "
+            "shard only fetches its own employee codes"
+        )
+
+    employees = db["employees"]
+    checkpoints = db["backfill_checkpoints"]
+
+    months = list(iter_months(args.start, args.end))
+    if not months:
+        sys.exit("Empty month range")
+
+    emp_filter = sorted(c.strip() for c in args.emp_codes.split(",") if c.strip())
+    query = {"is_active": True, "emp_code": {"$nin": [None, ""]}}
+    if emp_filter:
+        query["emp_code"]["$in"] = emp_filter
+
+    emp_codes = [str(e["emp_code"]).strip() for e in employees.find(query, {"emp_code": 1})]
+    if not emp_codes:
+        sys.exit("No matching active employees")
+
+    partitions = partition_codes(emp_codes, max(1, args.partitions))
+
+    # Checkpoints are per partition index, so the run is tied to the
+    # resolved code set: hiring or deactivating someone reshuffles the
+    # partitions and starts a new run instead of trusting stale shards
+    run_id = args.run_id or hashlib.sha1(
+        f"{args.start}|{args.end}|{args.partitions}|"
+        f"{';'.join(','.join(codes) for codes in partitions)}".encode()
+    ).hexdigest()[:12]
+
+    if args.restart:
+        checkpoints.delete_many({"run_id": run_id})
+
+    done = {
+        (c["month"], c["partition"])
+        for c in checkpoints.find(
+            {"run_id": run_id, "status": {"$in": [SHARD_DONE, SHARD_EMPTY]}},
+            {"month": 1, "partition": 1},
+        )
+    }
+
+    shards = [
+        (month, index, codes)
+        for month in months
+        for index, codes in enumerate(partitions)
+        if (month, index) not in done
+    ]
+
+    print(
+        f"Backfill {run_id}: {len(months)} month(s) x {len(partitions)} partition(s), "
+        f"{len(done)} shard(s) already done, {len(shards)} to run"
+    )
+
+    started = perf_counter()
+    total_employee_days = 0
+    failures = 0
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        futures = {
+            pool.submit(run_shard, month, codes): (month, index)
+            for month, index, codes in shards
+        }
+
+        for future in as_completed(futures):
+            month, index = futures[future]
+            checkpoint = {
+                "run_id": run_id,
+                "month": month,
+                "partition": index,
+                "finished_at": datetime.utcnow(),
+            }
+
+            try:
+                status, result, employee_days = future.result()
+            except Exception as exc:
+                failures += 1
+                checkpoint.update({"status": SHARD_FAILED, "error": str(exc)})
+                print(f"  {month} p{index}: FAILED {exc}")
+            else:
+                total_employee_days += employee_days
+                checkpoint.update({"status": status, "result": result})
+
+                elapsed = perf_counter() - started
+                print(
+                    f"  {month} p{index}: {status} "
+                    f"({total_employee_days} employee-days, "
+                    f"{total_employee_days / elapsed:.1f} employee-days/sec)"
+                )
+
+            checkpoints.update_one(
+                {"run_id": run_id, "month": month, "partition": index},
+                {"$set": checkpoint},
+                upsert=True,
+            )
+
+    elapsed = perf_counter() - started
+    print(
+        f"Backfill {run_id} finished in {elapsed:.1f}s: "
+        f"{total_employee_days} employee-days, {failures} failed shard(s)"
+    )
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
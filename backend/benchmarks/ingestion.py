@@ -0,0 +1,259 @@
+"""
+End-to-end ingestion and payroll-summary benchmark against a local
+mongod.
+
+    python -m benchmarks.ingestion --employees 4000 --month 2025-01 \\
+        --report bench.json [--compare previous.json]
+
+Seeds employees, generates a matching biometric export and measures
+each phase below for wall time, the phase's own peak RSS and Mongo
+round trips (by command and by collection):
+
+    upload_cold      process_biometric_stream on an empty month
+    upload_repeat    the same file again (fingerprints unchanged)
+    summary_cold     get_monthly_payroll_summary with no rollup stored
+    summary_warm     get_monthly_payroll_summary from the rollup
+
+The benchmark database (--db, default "payroll_bench") is dropped first.
+The JSON report is stable across runs so two commits can be diffed,
+or compared directly with --compare.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import Counter
+from time import perf_counter
+
+from pymongo import monitoring
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts Mongo commands per name and per collection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.by_command = Counter()
+            self.by_collection = Counter()
+            self.duration_ms = 0.0
+
+    def started(self, event):
+        name = event.command_name
+        collection = event.command.get(name)
+        if name == "getMore":
+            collection = event.command.get("collection")
+        with self._lock:
+            self.by_command[name] += 1
+            if isinstance(collection, str):
+                self.by_collection[collection] += 1
+
+    def succeeded(self, event):
+        with self._lock:
+            self.duration_ms += event.duration_micros / 1000
+
+    def failed(self, event):
+        with self._lock:
+            self.duration_ms += event.duration_micros / 1000
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "round_trips": sum(self.by_command.values()),
+                "server_ms": round(self.duration_ms, 1),
+                "by_command": dict(sorted(self.by_command.items())),
+                "by_collection": dict(sorted(self.by_collection.items())),
+            }
+
+
+def process_peak_rss_mb() -> float:
+    """Peak RSS of the whole process so far, earlier phases included."""
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the kernel's RSS high-water mark (Linux only), so the next
+    phase_peak_rss_mb covers just that phase. False when unsupported.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def phase_peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            match = re.search(r"^VmHWM:\s+(\d+) kB", f.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return round(int(match.group(1)) / 1024, 1) if match else None
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(counter: CommandCounter, name: str, fn):
+    counter.reset()
+    per_phase = reset_peak_rss()
+    started = perf_counter()
+    result = fn()
+    seconds = perf_counter() - started
+    peak = phase_peak_rss_mb() if per_phase else None
+
+    phase = {
+        "phase": name,
+        "seconds": round(seconds, 3),
+        "phase_peak_rss_mb": peak,
+        "mongo": counter.snapshot(),
+    }
+    if peak is None:
+        # Only the process-wide peak is available: includes earlier phases
+        phase["process_peak_rss_mb"] = process_peak_rss_mb()
+    if isinstance(result, dict):
+        phase["result"] = {
+            k: v for k, v in result.items()
+            if isinstance(v, (int, float)) and k != "elapsed_seconds"
+        }
+    elif isinstance(result, list):
+        phase["result"] = {"rows": len(result)}
+
+    if peak is None:
+        rss_label, rss = "process peak rss", phase["process_peak_rss_mb"]
+    else:
+        rss_label, rss = "peak rss", peak
+    print(
+        f"  {name:<15} {seconds:8.3f}s  {rss_label} {rss:7.1f} MB  "
+        f"{phase['mongo']['round_trips']:6d} round trips"
+    )
+    return phase
+
+
+def compare(report: dict, previous: dict):
+    before = {p["phase"]: p for p in previous.get("phases", [])}
+    print(f"\nvs {previous.get('commit') or 'previous report'}:")
+    for phase in report["phases"]:
+        old = before.get(phase["phase"])
+        if not old:
+            continue
+        print(
+            f"  {phase['phase']:<15} "
+            f"time {phase['seconds'] - old['seconds']:+8.3f}s  "
+            f"round trips {phase['mongo']['round_trips'] - old['mongo']['round_trips']:+6d}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestion benchmark")
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--month", default="2025-01", help="YYYY-MM")
+    parser.add_argument("--days", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="payroll_bench")
+    parser.add_argument("--report", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Previous JSON report to diff against")
+    args = parser.parse_args()
+
+    # Must be in place before app.database.mongo creates its clients
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db
+    os.environ.setdefault("BIOMETRIC_API_URL", "http://127.0.0.1:9/unused")
+    os.environ.setdefault("BIOMETRIC_API_TOKEN", "unused")
+
+    counter = CommandCounter()
+    monitoring.register(counter)
+
+    from app.database.indexes import ensure_indexes
+    from app.database.mongo import client, db
+    from app.services.attendance_service import (
+        get_monthly_payroll_summary,
+        process_biometric_stream,
+    )
+    from benchmarks.punch_generator import generate_punches, write_export
+    from benchmarks.seed import seed_employees
+
+    year, mon = map(int, args.month.split("-"))
+
+    print(f"Preparing {args.employees} employees in {args.db} ...")
+    client.drop_database(args.db)
+    ensure_indexes()
+    seed_employees(db, args.employees, args.seed)
+
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        export_path = tmp.name
+    try:
+        rows = write_export(
+            export_path,
+            generate_punches(args.employees, year, mon, args.days, args.seed),
+        )
+
+        def upload():
+            with open(export_path, "rb") as f:
+                return process_biometric_stream(f, args.month)
+
+        # The async Mongo client is bound to the first loop it runs on
+        loop = asyncio.new_event_loop()
+
+        def summary():
+            return loop.run_until_complete(get_monthly_payroll_summary(args.month))
+
+        phases = [measure(counter, "upload_cold", upload)]
+        phases.append(measure(counter, "upload_repeat", upload))
+
+        db["payroll_monthly"].delete_many({"month": args.month})
+        phases.append(measure(counter, "summary_cold", summary))
+        phases.append(measure(counter, "summary_warm", summary))
+        loop.close()
+    finally:
+        os.remove(export_path)
+
+    report = {
+        "commit": git_commit(),
+        "params": {
+            "employees": args.employees,
+            "month": args.month,
+            "days": args.days,
+            "seed": args.seed,
+            "punch_rows": rows,
+        },
+        "phases": phases,
+    }
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.report}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
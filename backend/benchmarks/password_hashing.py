@@ -0,0 +1,78 @@
+"""
+Login throughput of the bcrypt process pool.
+
+    python -m benchmarks.password_hashing --rounds 12 --logins 200
+
+Verifies ``--logins`` passwords for 1..N workers and prints logins/sec
+overall and per core, which is what sizing PASSWORD_HASH_WORKERS and
+BCRYPT_ROUNDS comes down to.
+"""
+import argparse
+import asyncio
+import json
+import os
+from time import perf_counter
+
+from passlib.context import CryptContext
+
+from app.core.password_hasher import PasswordHasher
+
+
+async def run_logins(hasher: PasswordHasher, hashed: str, logins: int):
+    # Warm the pool so process start-up is not measured
+    await asyncio.gather(*[
+        hasher.verify("secret", hashed) for _ in range(hasher.workers)
+    ])
+
+    started = perf_counter()
+    results = await asyncio.gather(*[
+        hasher.verify("secret", hashed) for _ in range(logins)
+    ])
+    elapsed = perf_counter() - started
+
+    assert all(results)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt login benchmark")
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    hashed = CryptContext(
+        schemes=["bcrypt"],
+        bcrypt__rounds=args.rounds,
+    ).hash("secret")
+
+    report = []
+    workers = 1
+    while workers <= args.max_workers:
+        hasher = PasswordHasher(workers=workers, max_concurrency=0, rounds=args.rounds)
+        try:
+            elapsed = asyncio.run(run_logins(hasher, hashed, args.logins))
+        finally:
+            hasher.shutdown()
+
+        per_sec = args.logins / elapsed
+        report.append({
+            "workers": workers,
+            "bcrypt_rounds": args.rounds,
+            "logins": args.logins,
+            "seconds": round(elapsed, 3),
+            "logins_per_sec": round(per_sec, 1),
+            "logins_per_sec_per_core": round(per_sec / workers, 1),
+            "max_queue_depth": hasher.max_queue_depth,
+        })
+        print(
+            f"workers={workers:<3} rounds={args.rounds} "
+            f"{per_sec:8.1f} logins/s  {per_sec / workers:7.1f} /s/core"
+        )
+        workers *= 2
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
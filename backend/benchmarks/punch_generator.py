@@ -0,0 +1,133 @@
+"""
+Synthetic biometric export in the InOutPunchData format.
+
+    python -m benchmarks.punch_generator --employees 4000 --month 2025-01 \\
+        --out /tmp/punches.json [--days 31] [--seed 1]
+
+Employees get a day, night (overnight) or split shift from their index,
+the same assignment benchmarks.seed uses, so the generated punches line
+up with the seeded employees. Sundays are mostly off; on working days a
+share of employees are absent or leave a punch missing ("--:--").
+"""
+import argparse
+import json
+import random
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+
+SHIFT_DAY = "DAY"
+SHIFT_NIGHT = "NIGHT"
+SHIFT_SPLIT = "SPLIT"
+
+# (shift, share of employees)
+SHIFT_MIX = [(SHIFT_DAY, 0.7), (SHIFT_NIGHT, 0.2), (SHIFT_SPLIT, 0.1)]
+
+# shift -> sessions as (start "HH:MM", minutes)
+SHIFT_SESSIONS = {
+    SHIFT_DAY: [("09:00", 480)],
+    SHIFT_NIGHT: [("22:00", 480)],
+    SHIFT_SPLIT: [("07:00", 240), ("15:00", 240)],
+}
+
+
+def emp_code_for(index: int) -> str:
+    return f"B{index:06d}"
+
+
+def shift_for(index: int) -> str:
+    # Deterministic so generator and seed agree without sharing state
+    point = (index * 0.618033988749895) % 1
+    for shift, share in SHIFT_MIX:
+        if point < share:
+            return shift
+        point -= share
+    return SHIFT_DAY
+
+
+def _punch_rows(rng, emp_code, day, shift, missing_rate):
+    rows = []
+    for start, minutes in SHIFT_SESSIONS[shift]:
+        in_dt = datetime.combine(day, datetime.strptime(start, "%H:%M").time())
+        in_dt += timedelta(minutes=rng.randint(-15, 20))
+        out_dt = in_dt + timedelta(minutes=minutes + rng.randint(-30, 90))
+
+        in_time = in_dt.strftime("%H:%M")
+        out_time = out_dt.strftime("%H:%M")
+        if rng.random() < missing_rate:
+            if rng.random() < 0.5:
+                in_time = "--:--"
+            else:
+                out_time = "--:--"
+
+        rows.append({
+            "Empcode": emp_code,
+            "DateString": day.strftime("%d/%m/%Y"),
+            "INTime": in_time,
+            "OUTTime": out_time,
+        })
+    return rows
+
+
+def generate_punches(
+    employees: int,
+    year: int,
+    month: int,
+    days: int = None,
+    seed: int = 1,
+    absent_rate: float = 0.05,
+    missing_rate: float = 0.03,
+    sunday_work_rate: float = 0.05,
+):
+    """Yields InOutPunchData rows, one day at a time."""
+    rng = random.Random(seed)
+    last_day = monthrange(year, month)[1]
+    days = min(days or last_day, last_day)
+
+    for day_number in range(1, days + 1):
+        day = date(year, month, day_number)
+        is_sunday = day.weekday() == 6
+
+        for index in range(1, employees + 1):
+            if is_sunday and rng.random() >= sunday_work_rate:
+                continue
+            if rng.random() < absent_rate:
+                continue
+
+            yield from _punch_rows(
+                rng, emp_code_for(index), day, shift_for(index), missing_rate
+            )
+
+
+def write_export(path: str, rows) -> int:
+    """Streams rows into a {"InOutPunchData": [...]} file; returns the row count."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"InOutPunchData": [')
+        for row in rows:
+            if count:
+                f.write(",")
+            f.write(json.dumps(row))
+            count += 1
+        f.write("]}")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic biometric punches")
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--month", default="2025-01", help="YYYY-MM")
+    parser.add_argument("--days", type=int, default=None, help="Defaults to the whole month")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    year, month = map(int, args.month.split("-"))
+    count = write_export(
+        args.out,
+        generate_punches(args.employees, year, month, args.days, args.seed),
+    )
+    print(f"Wrote {count} punch rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Employee seed data matching benchmarks.punch_generator.
+
+    python -m benchmarks.seed --employees 4000
+
+Writes into the database named by DB_NAME, so point it at a scratch
+database (the ingestion runner uses "payroll_bench").
+"""
+import argparse
+import random
+from datetime import datetime
+
+from benchmarks.punch_generator import (
+    SHIFT_DAY,
+    SHIFT_NIGHT,
+    SHIFT_SESSIONS,
+    emp_code_for,
+    shift_for,
+)
+
+DEPARTMENTS = {
+    "PROD": ["Operator", "Supervisor", "Technician"],
+    "QA": ["Inspector", "Analyst"],
+    "HR": ["Executive", "Manager"],
+    "ACC": ["Accountant", "Clerk"],
+}
+
+SHIFT_TIMES = {
+    SHIFT_DAY: ("09:00", "17:00"),
+    SHIFT_NIGHT: ("22:00", "06:00"),
+}
+
+
+def build_employees(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    departments = sorted(DEPARTMENTS)
+
+    for index in range(1, count + 1):
+        department = departments[index % len(departments)]
+        shift = shift_for(index)
+        start, end = SHIFT_TIMES.get(shift, ("07:00", "19:00"))
+        duty_minutes = sum(minutes for _, minutes in SHIFT_SESSIONS[shift])
+
+        yield {
+            "user_id": None,
+            "email": f"bench{index}@example.com",
+            "full_name": f"Bench Employee {index}",
+            "designation": rng.choice(DEPARTMENTS[department]),
+            "department": department,
+            "employment_type": "FULL_TIME",
+            "emp_code": emp_code_for(index),
+            "shift": shift,
+            "shift_start_time": start,
+            "shift_end_time": end,
+            "total_duty_hours_per_day": duty_minutes / 60,
+            "salary": float(rng.randrange(18000, 90000, 500)),
+            "date_of_joining": datetime(2020, 1, 1),
+            "is_active": True,
+            "created_at": datetime.utcnow(),
+            "benchmark": True,
+        }
+
+
+def seed_employees(db, count: int, seed: int = 1, batch_size: int = 1000):
+    """Replaces previously seeded benchmark employees; returns the count."""
+    employees = db["employees"]
+    employees.delete_many({"benchmark": True})
+
+    batch = []
+    for doc in build_employees(count, seed):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            employees.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        employees.insert_many(batch, ordered=False)
+
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed benchmark employees")
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from app.database.mongo import db
+
+    seed_employees(db, args.employees, args.seed)
+    print(f"Seeded {args.employees} employees into {db.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Local stand-in for the biometric punch API.
+
+Serves the InOutPunchData rows of a JSON export, filtered by the same
+Empcode / FromDate / ToDate query parameters the real API takes:
+
+    python biometric_stub_server.py export.json --port 8900 --fail-rate 0.1
+
+then point the backend at it with
+BIOMETRIC_API_URL=http://127.0.0.1:8900/api/punches
+"""
+import argparse
+import json
+import random
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def parse_dmy(value: str):
+    return datetime.strptime(value, "%d/%m/%Y").date()
+
+
+def make_handler(rows: list, fail_rate: float):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if random.random() < fail_rate:
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            query = parse_qs(urlparse(self.path).query)
+            try:
+                from_date = parse_dmy(query["FromDate"][0])
+                to_date = parse_dmy(query["ToDate"][0])
+            except (KeyError, ValueError):
+                self.send_response(400)
+                self.end_headers()
+                return
+
+            empcode = query.get("Empcode", ["ALL"])[0]
+            codes = None if empcode == "ALL" else set(empcode.split(","))
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+
+            # Stream the body row by row like a large export would arrive
+            self.wfile.write(b'{"InOutPunchData": [')
+            first = True
+            for row in rows:
+                if codes is not None and str(row.get("Empcode")) not in codes:
+                    continue
+                try:
+                    day = parse_dmy(row.get("DateString", ""))
+                except ValueError:
+                    continue
+                if not from_date <= day <= to_date:
+                    continue
+
+                if not first:
+                    self.wfile.write(b",")
+                self.wfile.write(json.dumps(row).encode())
+                first = False
+            self.wfile.write(b"]}")
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Biometric API stub server")
+    parser.add_argument("export", help="JSON file with an InOutPunchData array")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument(
+        "--fail-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 503 to exercise retries",
+    )
+    args = parser.parse_args()
+
+    with open(args.export) as f:
+        rows = json.load(f).get("InOutPunchData") or []
+
+    server = ThreadingHTTPServer(
+        (args.host, args.port),
+        make_handler(rows, args.fail_rate),
+    )
+    print(f"Biometric stub serving {len(rows)} rows on http://{args.host}:{args.port}/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
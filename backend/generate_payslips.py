@@ -0,0 +1,49 @@
+"""
+Generates the payslips of one month from the command line, e.g. from
+cron after the month's attendance is final. Only payslips whose inputs
+changed since the previous run are rewritten.
+
+    python generate_payslips.py --month 2025-01 [--workers 8] [--force] \\
+        [--output-dir /var/lib/payroll/payslips]
+"""
+import argparse
+import sys
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate monthly payslips")
+    parser.add_argument("--month", required=True, help="YYYY-MM")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output-dir", default=None)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every payslip, not only the changed ones",
+    )
+    args = parser.parse_args()
+
+    from fastapi import HTTPException
+    from app.services.payslip_service import generate_month_payslips
+
+    def progress(processed, total):
+        print(f"  {processed}/{total} employees")
+
+    try:
+        result = generate_month_payslips(
+            args.month,
+            workers=args.workers,
+            force=args.force,
+            output_dir=args.output_dir,
+            progress=progress,
+        )
+    except HTTPException as exc:
+        sys.exit(exc.detail)
+
+    print(
+        f"{result['month']}: {result['generated']} generated, "
+        f"{result['unchanged']} unchanged in {result['elapsed_seconds']}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
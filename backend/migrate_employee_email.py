@@ -0,0 +1,84 @@
+"""
+Copies each employee's login email from users onto the employee
+document, so the employee listing no longer has to join users
+(previously an unindexable $toObjectId + $lookup per row).
+
+Only employees without an email are touched, so it is safe to re-run.
+
+    python migrate_employee_email.py [--batch-size 1000] [--dry-run]
+"""
+import argparse
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Denormalize user email onto employees")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    from app.database.mongo import db
+
+    employees = db["employees"]
+    users = db["users"]
+
+    pending = employees.find(
+        {"email": {"$exists": False}, "user_id": {"$nin": [None, ""]}},
+        {"user_id": 1},
+    )
+
+    updated = 0
+    missing = []
+    batch = []
+
+    def migrate_batch(batch):
+        user_ids = {}
+        for emp in batch:
+            try:
+                user_ids[emp["_id"]] = ObjectId(emp["user_id"])
+            except Exception:
+                missing.append(emp["_id"])
+
+        emails = {
+            u["_id"]: u.get("email")
+            for u in users.find({"_id": {"$in": list(user_ids.values())}}, {"email": 1})
+        }
+
+        ops = []
+        for emp_id, user_id in user_ids.items():
+            email = emails.get(user_id)
+            if not email:
+                missing.append(emp_id)
+                continue
+            ops.append(UpdateOne(
+                {"_id": emp_id, "email": {"$exists": False}},
+                {"$set": {"email": email}},
+            ))
+        if ops and not args.dry_run:
+            employees.bulk_write(ops, ordered=False)
+        return len(ops)
+
+    for emp in pending:
+        batch.append(emp)
+        if len(batch) >= args.batch_size:
+            updated += migrate_batch(batch)
+            batch = []
+    if batch:
+        updated += migrate_batch(batch)
+
+    if updated and not args.dry_run:
+        from app.database.versions import bump_version
+        bump_version("employees")
+
+    action = "Would update" if args.dry_run else "Updated"
+    print(f"{action} {updated} employee(s)")
+    if missing:
+        print(f"{len(missing)} employee(s) have no matching user:")
+        for emp_id in missing:
+            print(f"  {emp_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Recomputes the payroll_monthly rollups and the payroll_cube analytics
+buckets for a range of months, e.g. to fill the cube for months
+ingested before it existed.
+
+    python rebuild_payroll_rollups.py --from 2024-01 --to 2025-12
+"""
+import argparse
+import sys
+
+from backfill_attendance import iter_months
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild payroll rollups")
+    parser.add_argument("--from", dest="start", required=True, help="YYYY-MM")
+    parser.add_argument("--to", dest="end", required=True, help="YYYY-MM")
+    args = parser.parse_args()
+
+    from app.services.attendance_service import refresh_payroll_rollup
+
+    months = list(iter_months(args.start, args.end))
+    if not months:
+        sys.exit("Empty month range")
+
+    for month in months:
+        refresh_payroll_rollup(month)
+        print(f"  {month}: done")
+
+
+if __name__ == "__main__":
+    main()
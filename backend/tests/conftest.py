@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+# Settings are read when app modules are imported: point them at a
+# throwaway database before any test module imports the app
+os.environ.setdefault("BIOMETRIC_API_URL", "http://biometric.invalid/api")
+os.environ.setdefault("BIOMETRIC_API_TOKEN", "test")
+os.environ["MONGO_URL"] = os.environ.get("TEST_MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = os.environ.get("TEST_DB_NAME", "payroll_test")
+
+_mongo_available = None
+
+
+def _ping_mongo() -> bool:
+    global _mongo_available
+    if _mongo_available is None:
+        from pymongo import MongoClient
+        from pymongo.errors import PyMongoError
+
+        probe = MongoClient(os.environ["MONGO_URL"], serverSelectionTimeoutMS=1000)
+        try:
+            probe.admin.command("ping")
+            _mongo_available = True
+        except PyMongoError:
+            _mongo_available = False
+        finally:
+            probe.close()
+    return _mongo_available
+
+
+@pytest.fixture
+def mongo_db():
+    """
+    The app's database, emptied and indexed. Tests using it are skipped
+    when no MongoDB answers at TEST_MONGO_URL.
+    """
+    if not _ping_mongo():
+        pytest.skip("MongoDB not reachable at TEST_MONGO_URL")
+
+    from app.database.indexes import ensure_indexes
+    from app.database.mongo import client, db
+
+    client.drop_database(db.name)
+    ensure_indexes()
+    yield db
+    client.drop_database(db.name)
@@ -0,0 +1,15 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.dates import parse_month
+
+
+def test_parse_month_returns_the_bounds():
+    assert parse_month("2024-12") == (2024, 12, "2024-12-01", "2025-01-01")
+
+
+@pytest.mark.parametrize("month", ["2024-13", "2024", "2024-1-1", "Jan 2024", "", None])
+def test_parse_month_rejects_bad_input(month):
+    with pytest.raises(HTTPException) as exc:
+        parse_month(month)
+    assert exc.value.status_code == 400
@@ -0,0 +1,78 @@
+import io
+import json
+
+import pytest
+
+from app.utils.json_stream import iter_json_array
+
+KEY = "InOutPunchData"
+ROWS = [{"Empcode": str(i), "INTime": "09:00", "Note": "é,]}\"\\"} for i in range(5)]
+
+
+def _items(document, chunk_size=64 * 1024, **kwargs):
+    data = document if isinstance(document, bytes) else document.encode()
+    return list(iter_json_array(io.BytesIO(data), KEY, chunk_size=chunk_size, **kwargs))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, 64 * 1024])
+def test_items_survive_any_chunk_boundary(chunk_size):
+    document = json.dumps({"meta": {"source": "device"}, KEY: ROWS}, ensure_ascii=False)
+    assert _items(document, chunk_size) == ROWS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64 * 1024])
+def test_key_text_elsewhere_is_skipped(chunk_size):
+    document = json.dumps({
+        "meta": {"x": KEY, KEY: [{"nested": True}]},
+        "note": f'say "{KEY}"',
+        "list": [{KEY: [1]}, KEY],
+        KEY: ROWS,
+    })
+    assert _items(document, chunk_size) == ROWS
+
+
+def test_escaped_key_matches():
+    document = '{"InOut\\u0050unchData": [1, 2]}'
+    assert _items(document, chunk_size=2) == [1, 2]
+
+
+def test_first_top_level_key_wins_on_duplicates():
+    assert _items('{"InOutPunchData": [1], "InOutPunchData": [2]}') == [1]
+
+
+def test_scalars_split_across_chunks():
+    assert _items('{"InOutPunchData": [12345, true, null, "ab"]}', chunk_size=1) == [
+        12345, True, None, "ab",
+    ]
+
+
+def test_bom_and_null_array():
+    assert _items(b'\xef\xbb\xbf{"InOutPunchData": null}', chunk_size=1) == []
+
+
+@pytest.mark.parametrize("document", [
+    "{}",
+    '{"meta": {"InOutPunchData": [1]}}',
+    '[{"InOutPunchData": [1]}]',
+    '{"other": "InOutPunchData"}',
+])
+def test_missing_top_level_key(document):
+    with pytest.raises(KeyError):
+        _items(document, chunk_size=2)
+
+
+@pytest.mark.parametrize("document", [
+    '{"InOutPunchData": 5}',
+    '{"InOutPunchData": [1, 2',
+    '{"InOutPunchData": [{"a": }]}',
+    '{"note": "unterminated',
+])
+def test_malformed_documents(document):
+    with pytest.raises(ValueError):
+        _items(document, chunk_size=3)
+
+
+def test_oversized_item_is_rejected():
+    document = json.dumps({KEY: ["x" * 100]})
+    with pytest.raises(ValueError):
+        _items(document, chunk_size=8, max_item_size=32)
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.attendance_service import build_manual_day, parse_manual_datetimes
+
+RECORD = {"date": "2025-01-10"}
+EMPLOYEE = {"total_duty_hours_per_day": 8, "salary": 31000}
+
+
+def _manual_day(in_datetime, out_datetime):
+    in_dt, out_dt = parse_manual_datetimes(in_datetime, out_datetime)
+    return build_manual_day(RECORD, EMPLOYEE, in_dt, out_dt)["$set"]
+
+
+def test_day_shift_offsets():
+    fields = _manual_day("2025-01-10T09:00", "2025-01-10T17:30")
+    assert fields["punch_minutes"] == [540, 1050]
+    assert fields["work_minutes"] == 510
+
+
+def test_overnight_shift_runs_into_the_next_day():
+    fields = _manual_day("2025-01-10T22:00", "2025-01-10T06:00")
+    assert fields["punch_minutes"] == [1320, 1800]
+    assert fields["work_minutes"] == 480
+
+
+@pytest.mark.parametrize("in_datetime, out_datetime", [
+    ("2025-01-09T09:00", "2025-01-09T17:00"),  # the day before
+    ("2025-01-11T09:00", "2025-01-11T17:00"),  # the day after
+    ("2025-01-10T09:00", "2025-01-12T08:00"),  # out past the overnight window
+    ("2025-02-10T09:00", "2025-02-10T17:00"),  # another month
+])
+def test_times_outside_the_record_day_are_rejected(in_datetime, out_datetime):
+    in_dt = datetime.fromisoformat(in_datetime)
+    out_dt = datetime.fromisoformat(out_datetime)
+    with pytest.raises(HTTPException) as exc:
+        build_manual_day(RECORD, EMPLOYEE, in_dt, out_dt)
+    assert exc.value.status_code == 400
@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from app.core.password_hasher import PasswordHasher
+
+
+def _slow(value):
+    time.sleep(0.05)
+    return value
+
+
+def _hasher(max_concurrency):
+    hasher = PasswordHasher(workers=1, max_concurrency=max_concurrency, rounds=4)
+    # The loop's default thread pool instead of bcrypt worker processes
+    hasher._get_pool = lambda: None
+    return hasher
+
+
+def test_callers_with_a_free_slot_are_not_queued():
+    hasher = _hasher(max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(hasher._run(_slow, 1), hasher._run(_slow, 2))
+
+    assert asyncio.run(run()) == [1, 2]
+    stats = hasher.stats()
+    assert stats["max_queue_depth"] == 0
+    assert stats["completed"] == 2
+
+
+def test_callers_beyond_the_limit_are_queued():
+    hasher = _hasher(max_concurrency=1)
+
+    async def run():
+        return await asyncio.gather(*(hasher._run(_slow, i) for i in range(3)))
+
+    assert asyncio.run(run()) == [0, 1, 2]
+    stats = hasher.stats()
+    assert stats["max_queue_depth"] == 2
+    assert stats["queue_depth"] == 0
@@ -0,0 +1,111 @@
+import threading
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.services import analytics_service
+
+MONTH = "2025-01"
+EMPLOYEE_ID = ObjectId()
+
+
+def _rollup(mongo_db, total_salary):
+    mongo_db["payroll_monthly"].update_one(
+        {"employee_id": EMPLOYEE_ID, "month": MONTH},
+        {"$set": {
+            "department": "HR",
+            "designation": "Clerk",
+            "present": 20,
+            "absent": 2,
+            "working_days": 22,
+            "ot_minutes": 0,
+            "total_salary": total_salary,
+        }},
+        upsert=True,
+    )
+
+
+
+class _PausingCollection:
+    """Holds the first aggregate after it has read, until released."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.read = threading.Event()
+        self.release = threading.Event()
+
+    def aggregate(self, pipeline):
+        rows = list(self._collection.aggregate(pipeline))
+        if not self.read.is_set():
+            self.read.set()
+            self.release.wait(5)
+        return iter(rows)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+def test_overlapping_refreshes_keep_the_newest_result(mongo_db, monkeypatch):
+    _rollup(mongo_db, 1000)
+    paused = _PausingCollection(mongo_db["payroll_monthly"])
+    monkeypatch.setattr(analytics_service, "payroll_monthly", paused)
+
+    # The first refresh reads the old rollup, then stalls
+    stale = threading.Thread(target=analytics_service.refresh_payroll_cube, args=(MONTH,))
+    stale.start()
+    assert paused.read.wait(5)
+
+    # The rollup changes and a second refresh starts meanwhile
+    _rollup(mongo_db, 2500)
+    fresh = threading.Thread(target=analytics_service.refresh_payroll_cube, args=(MONTH,))
+    fresh.start()
+    fresh.join(0.3)
+    assert fresh.is_alive(), "second refresh of the month did not wait for the first"
+
+    paused.release.set()
+    stale.join(5)
+    fresh.join(5)
+
+    cube = list(mongo_db["payroll_cube"].find({"month": MONTH}))
+    assert [c["salary_cost"] for c in cube] == [2500]
+    assert mongo_db["payroll_cube_locks"].count_documents({}) == 0
+
+
+def test_expired_lock_is_taken_over(mongo_db):
+    mongo_db["payroll_cube_locks"].insert_one({
+        "_id": MONTH,
+        "owner": ObjectId(),
+        "locked_until": datetime.utcnow() - timedelta(seconds=1),
+    })
+    _rollup(mongo_db, 1000)
+
+    analytics_service.refresh_payroll_cube(MONTH)
+
+    assert mongo_db["payroll_cube"].find_one({"month": MONTH})["salary_cost"] == 1000
+
+
+def test_moving_an_employee_moves_their_cube_figures(mongo_db):
+    import asyncio
+
+    from app.services.employee_service import update_employee
+
+    mongo_db["employees"].insert_one({
+        "_id": EMPLOYEE_ID,
+        "full_name": "A",
+        "department": "HR",
+        "designation": "Clerk",
+        "is_active": True,
+    })
+    _rollup(mongo_db, 1000)
+    analytics_service.refresh_payroll_cube(MONTH)
+
+    asyncio.run(update_employee(str(EMPLOYEE_ID), {"department": "Finance"}))
+
+    rollup = mongo_db["payroll_monthly"].find_one({"employee_id": EMPLOYEE_ID})
+    assert (rollup["department"], rollup["designation"]) == ("Finance", "Clerk")
+
+    cube = {
+        (c["department"], c["designation"]): c["salary_cost"]
+        for c in mongo_db["payroll_cube"].find({"month": MONTH})
+    }
+    assert cube == {("Finance", "Clerk"): 1000}
@@ -0,0 +1,58 @@
+from datetime import date
+
+import pytest
+
+from app.schemas.payroll_schema import PayrollSimulationSchema
+from app.services import attendance_service
+from app.services.payroll_engine import simulate_payroll
+
+MONTH = "2025-01"
+
+
+@pytest.fixture
+def attendance(mongo_db):
+    """Two employees: a full month with overtime and a short manual day."""
+    employees = mongo_db["employees"]
+    for code, salary in (("1", 31000), ("2", 46500)):
+        employees.insert_one({
+            "emp_code": code,
+            "full_name": f"E{code}",
+            "is_active": True,
+            "total_duty_hours_per_day": 8,
+            "salary": salary,
+        })
+
+    punches = {
+        ("1", date(2025, 1, 2)): [(540, 1200)],  # 11h: overtime
+        ("1", date(2025, 1, 3)): [(540, 1020)],
+        ("2", date(2025, 1, 2)): [(540, 720), (780, 1020)],
+        ("2", date(2025, 1, 6)): [(540, 1020)],
+    }
+    attendance_service.ingest_biometric_punches(punches, 2025, 1)
+
+    # A short manual correction is prorated
+    record = mongo_db["attendance_daily"].find_one({"emp_code": "2", "date": "2025-01-06"})
+    attendance_service.edit_attendance_manual(
+        str(record["_id"]), "2025-01-06T09:00", "2025-01-06T13:00"
+    )
+    return mongo_db
+
+
+def test_baseline_matches_the_payroll_rollup(attendance):
+    result = simulate_payroll(PayrollSimulationSchema(month=MONTH))
+
+    rolled_up = {
+        str(r["employee_id"]): r["total_salary"]
+        for r in attendance["payroll_monthly"].find({"month": MONTH})
+    }
+    assert {r["employee_id"]: r["current_salary"] for r in result["employees"]} == rolled_up
+    assert result["totals"]["current_salary"] == round(sum(rolled_up.values()), 2)
+    assert result["totals"]["difference"] == 0
+
+
+def test_paying_overtime_is_the_whole_difference(attendance):
+    result = simulate_payroll(PayrollSimulationSchema(month=MONTH, pay_overtime=True))
+    totals = result["totals"]
+
+    assert totals["ot_amount"] > 0
+    assert totals["difference"] == totals["ot_amount"]
@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.constants import ROLE_ADMIN
+from app.core.security import create_access_token, invalidate_cached_user
+
+
+@pytest.fixture
+def client(mongo_db):
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _admin_token(mongo_db, is_active=True):
+    user_id = mongo_db["users"].insert_one({
+        "email": "admin@example.com",
+        "role": ROLE_ADMIN,
+        "is_active": is_active,
+    }).inserted_id
+    invalidate_cached_user(user_id)
+    token = create_access_token({"user_id": str(user_id), "role": ROLE_ADMIN})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_active_admin_gets_a_profile(client, mongo_db):
+    response = client.get("/admin/employees", headers={
+        **_admin_token(mongo_db), "X-Profile": "cprofile",
+    })
+
+    assert response.status_code == 200
+    assert "x-profile-id" in response.headers
+
+
+def test_deactivated_admin_token_cannot_profile(client, mongo_db):
+    response = client.get("/admin/employees", headers={
+        **_admin_token(mongo_db, is_active=False), "X-Profile": "cprofile",
+    })
+
+    assert response.status_code == 401
+    assert "x-profile-id" not in response.headers
+    assert mongo_db["request_profiles"].count_documents({}) == 0
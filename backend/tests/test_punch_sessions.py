@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+from app.services.attendance_service import (
+    collect_month_punches,
+    compile_day_punches,
+    session_minutes,
+)
+
+
+@pytest.mark.parametrize("raw, sessions, open_punches", [
+    # Complete rows, in any order
+    ([(780, 1020), (540, 720)], (540, 720, 780, 1020), ()),
+    # Lone IN and lone OUT rows pair up in time order
+    ([(540, None), (None, 1020)], (540, 1020), ()),
+    ([(540, None), (600, None), (None, 700)], (540, 700), (600,)),
+    # Nothing to pair with
+    ([(540, None)], (), (540,)),
+    ([(None, 1020)], (), (1020,)),
+    # An OUT before the only IN can't close it
+    ([(None, 500), (540, None)], (), (500, 540)),
+    # Overlapping and touching sessions merge
+    ([(540, 800), (700, 1020)], (540, 1020), ()),
+    ([(540, 720), (720, 900)], (540, 900), ()),
+    ([(540, 1020), (600, 700)], (540, 1020), ()),
+    # Overnight: OUT past midnight is an offset beyond 1440
+    ([(1320, 1800)], (1320, 1800), ()),
+    ([(1320, None), (None, 1800)], (1320, 1800), ()),
+    # Duplicate lone punches are reported once
+    ([(540, None), (540, None)], (), (540,)),
+    ([], (), ()),
+])
+def test_compile_day_punches(raw, sessions, open_punches):
+    assert compile_day_punches(raw) == (sessions, open_punches)
+
+
+@pytest.mark.parametrize("sessions, minutes", [
+    ((), 0),
+    ((540, 720, 780, 1020), 420),
+    ((1320, 1800), 480),
+    ((540, 720, 780), 180),  # a trailing unmatched offset is ignored
+])
+def test_session_minutes(sessions, minutes):
+    assert session_minutes(sessions) == minutes
+
+
+def test_overnight_row_is_collected_on_its_in_date():
+    rows = [
+        {"Empcode": "7", "DateString": "10/01/2025", "INTime": "22:00", "OUTTime": "06:00"},
+        {"Empcode": "7", "DateString": "11/01/2025", "INTime": "09:00", "OUTTime": "--:--"},
+        {"Empcode": "7", "DateString": "11/02/2025", "INTime": "09:00", "OUTTime": "17:00"},
+    ]
+    punches, row_count = collect_month_punches(rows, 2025, 1)
+
+    assert row_count == 3
+    assert punches == {
+        ("7", date(2025, 1, 10)): [(1320, 1800)],
+        ("7", date(2025, 1, 11)): [(540, None)],
+    }
+    assert compile_day_punches(punches[("7", date(2025, 1, 10))]) == ((1320, 1800), ())
@@ -82,7 +82,28 @@ export default function Attendance() {
         message: "Attendance loading...",
       });
 
-      await api.post("/admin/attendance/fetch", { month });
+      const { data: submitted } = await api.post("/admin/attendance/fetch", {
+        month,
+      });
+
+      // Ingestion runs as a background job → poll until it finishes
+      let job = submitted;
+      while (job.status === "QUEUED" || job.status === "RUNNING") {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const res = await api.get(`/admin/attendance/jobs/${submitted.job_id}`);
+        job = res.data;
+
+        if (job.progress?.total) {
+          setNotification({
+            type: "success",
+            message: `Attendance loading... ${job.progress.processed}/${job.progress.total} employees`,
+          });
+        }
+      }
+
+      if (job.status !== "COMPLETED") {
+        throw { response: { data: { detail: job.error || `Job ${job.status.toLowerCase()}` } } };
+      }
 
       setNotification({
         type: "success",
@@ -120,7 +120,8 @@ export default function AttendanceSalaryTable({
         row.status === "PRESENT_COMPLETE" ||
         row.status === "PRESENT_INCOMPLETE" ||
         row.status === "PRESENT_OVERTIME" ||
-        row.status === "WEEKLY_OFF"
+        row.status === "WEEKLY_OFF" ||
+        row.status === "HOLIDAY"
       ) {
         acc.present += 1;
       } else if (row.status === "ABSENT") {
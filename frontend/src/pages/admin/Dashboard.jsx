@@ -37,7 +37,8 @@ export default function AdminDashboard() {
         row.status === "PRESENT_COMPLETE" ||
         row.status === "PRESENT_INCOMPLETE" ||
         row.status === "PRESENT_OVERTIME" ||
-        row.status === "WEEKLY_OFF"
+        row.status === "WEEKLY_OFF" ||
+        row.status === "HOLIDAY"
       ) {
         present += 1;
       } else if (row.status === "ABSENT") {